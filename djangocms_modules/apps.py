@@ -1,4 +1,4 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 from django.utils.translation import gettext_lazy as _
 
 
@@ -8,4 +8,32 @@ class ModulesConfig(AppConfig):
     verbose_name = _('django CMS Modules')
 
     def ready(self):
-        import djangocms_modules.handlers  # noqa
+        from django.core.signals import request_finished, request_started
+
+        from cms.signals import post_placeholder_operation, pre_placeholder_operation
+
+        from . import handlers
+        from .utils import disable_request_cache, enable_request_cache
+
+        request_started.connect(enable_request_cache, dispatch_uid='djangocms_modules_enable_request_cache')
+        request_finished.connect(disable_request_cache, dispatch_uid='djangocms_modules_disable_request_cache')
+        pre_placeholder_operation.connect(
+            handlers.sync_module_plugin,
+            dispatch_uid='djangocms_modules_sync_module_plugin',
+        )
+        post_placeholder_operation.connect(
+            handlers.refresh_module_content_hash,
+            dispatch_uid='djangocms_modules_refresh_module_content_hash',
+        )
+
+        if apps.is_installed('djangocms_history'):
+            from djangocms_history import signals
+
+            signals.post_operation_undo.connect(
+                handlers.sync_module_category,
+                dispatch_uid='undo_sync_module_category',
+            )
+            signals.post_operation_redo.connect(
+                handlers.sync_module_category,
+                dispatch_uid='redo_sync_module_category',
+            )
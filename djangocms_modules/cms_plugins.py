@@ -1,11 +1,16 @@
 import copy
 import json
+from operator import itemgetter
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.urls import path, reverse
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from django.utils.encoding import force_str
 from django.utils.http import urlencode
 from django.utils.translation import get_language_from_request
@@ -17,11 +22,21 @@ from cms.exceptions import PluginLimitReached
 from cms.models import CMSPlugin
 from cms.plugin_base import CMSPluginBase, PluginMenuItem
 from cms.plugin_pool import plugin_pool
-from cms.utils.plugins import copy_plugins_to_placeholder, get_bound_plugins, has_reached_plugin_limit, reorder_plugins
+from cms.utils.plugins import copy_plugins_to_placeholder, get_bound_plugins, has_reached_plugin_limit
 from cms.utils.urlutils import admin_reverse
 
-from .forms import AddModuleForm, CreateModuleForm, NewModuleForm
-from .models import Category, ModulePlugin
+from .models import Category, ModulePlugin, get_content_hash
+from .usage import APPLIED, PREVIEWED, count_module_usage
+from .utils import (
+    get_add_module_url, get_module_categories, get_module_preview_url, get_modules_list_url, prefetch_module_plugins,
+)
+
+
+class ConcurrentModification(Exception):
+    """
+    Raised when the siblings of an inserted module
+    have been changed by another request.
+    """
 
 
 def post_add_plugin(operation, **kwargs):
@@ -60,7 +75,9 @@ class Module(CMSPluginBase):
         urlpatterns = [
             path('create-module/', self.create_module_view, name='cms_create_module'),
             path('add-module/<int:module_id>/', self.add_module_view, name='cms_add_module'),
+            path('module-preview/<int:module_id>/', self.module_preview_view, name='cms_module_preview'),
             path('modules/', self.modules_list_view, name='cms_modules_list'),
+            path('modules/catalog/', self.modules_catalog_view, name='cms_modules_catalog'),
         ]
         return urlpatterns
 
@@ -104,17 +121,24 @@ class Module(CMSPluginBase):
         ]
 
     @classmethod
-    def create_module_plugin(cls, name, category, plugins):
+    def create_module_plugin(cls, name, category, plugins, language=None, content_hash=None):
+        # Modules are created in the default language,
+        # other languages are kept in sync by "sync_module_languages".
+        language = language or settings.LANGUAGE_CODE
         placeholder = category.modules
-        position = placeholder.get_plugins().filter(parent__isnull=True).count()
+        position = placeholder.get_plugins(language).filter(parent__isnull=True).count()
         plugin_kwargs = {
             'plugin_type': cls.__name__,
             'placeholder_id': category.modules_id,
-            'language': settings.LANGUAGE_CODE,
+            'language': language,
             'position': position,
         }
         plugin = CMSPlugin.add_root(**plugin_kwargs)
-        instance = cls.model(module_name=name, module_category=category)
+        instance = cls.model(
+            module_name=name,
+            module_category=category,
+            content_hash=get_content_hash(plugins) if content_hash is None else content_hash,
+        )
         plugin.set_base_attr(instance)
         instance.save()
         copy_plugins_to_placeholder(
@@ -123,12 +147,101 @@ class Module(CMSPluginBase):
             language=plugin.language,
             root_plugin=plugin,
         )
+        return instance
+
+    @classmethod
+    def insert_module_plugin(cls, module_plugin, placeholder, language, parent=None, position=None):
+        """
+        Copies the given module into the placeholder (or parent plugin)
+        at the given position, appending it if no position is given.
+
+        Only the siblings after the insertion point are moved, with a single
+        update. Raises ConcurrentModification if the siblings have been
+        changed by another request in the meantime.
+        """
+        if parent:
+            # Might be outdated by a previous attempt
+            parent.refresh_from_db(fields=['numchild'])
+
+        siblings = CMSPlugin.objects.filter(placeholder=placeholder, language=language, parent=parent)
+        # The siblings (and their positions) are the version of the tree,
+        # which is checked again once the module has been inserted.
+        version = list(siblings.order_by('position', 'pk').values_list('pk', 'position'))
+
+        if position is None or position >= len(version):
+            new_position = version[-1][1] + 1 if version else 0
+        else:
+            new_position = version[position][1]
+
+        new_plugins = copy_plugins_to_placeholder(
+            plugins=list(module_plugin.get_unbound_plugins()),
+            placeholder=placeholder,
+            language=language,
+            root_plugin=parent,
+        )
+        new_plugin = new_plugins[0]
+        siblings.filter(position__gte=new_position).exclude(pk=new_plugin.pk).update(position=F('position') + 1)
+        CMSPlugin.objects.filter(pk=new_plugin.pk).update(position=new_position)
+
+        expected = {(pk, pos + 1 if pos >= new_position else pos) for pk, pos in version}
+        expected.add((new_plugin.pk, new_position))
+
+        if set(siblings.values_list('pk', 'position')) != expected:
+            raise ConcurrentModification
+        return cls.model.objects.get(pk=new_plugin.pk)
+
+    @classmethod
+    def get_duplicate_module(cls, category, content_hash, language=None):
+        """
+        Returns a module of the given category with
+        the given content hash, if there is one.
+        """
+        if not content_hash:
+            return None
+
+        duplicates = (
+            cls
+            .model
+            .get_library_modules()
+            .filter(
+                module_category=category,
+                language=language or settings.LANGUAGE_CODE,
+                content_hash=content_hash,
+            )
+            .order_by('path')
+        )
+
+        for duplicate in duplicates:
+            # Stored hashes are outdated if a module has been
+            # changed without a placeholder operation (e.g. an undo).
+            current_hash = duplicate.get_content_hash()
+
+            if current_hash == content_hash:
+                return duplicate
+            duplicate.update(content_hash=current_hash)
+        return None
+
+    @classmethod
+    def render_create_module_form(cls, request, form):
+        opts = cls.model._meta
+        context = {
+            'form': form,
+            'has_change_permission': True,
+            'opts': opts,
+            'root_path': reverse('admin:index'),
+            'is_popup': True,
+            'app_label': opts.app_label,
+            'media': (cls().media + form.media),
+        }
+        return render(request, 'djangocms_modules/create_module.html', context)
 
     @classmethod
     def create_module_view(cls, request):
         if not request.user.is_staff:
             raise PermissionDenied
 
+        from .forms import CreateModuleForm, NewModuleForm
+
         new_form = NewModuleForm(request.GET or None)
 
         if new_form.is_valid():
@@ -143,17 +256,7 @@ class Module(CMSPluginBase):
         create_form.set_category_widget(request)
 
         if not create_form.is_valid():
-            opts = cls.model._meta
-            context = {
-                'form': create_form,
-                'has_change_permission': True,
-                'opts': opts,
-                'root_path': reverse('admin:index'),
-                'is_popup': True,
-                'app_label': opts.app_label,
-                'media': (cls().media + create_form.media),
-            }
-            return render(request, 'djangocms_modules/create_module.html', context)
+            return cls.render_create_module_form(request, create_form)
 
         plugins = create_form.get_plugins()
 
@@ -166,14 +269,45 @@ class Module(CMSPluginBase):
         if not category.modules.has_add_plugins_permission(request.user, plugins):
             raise PermissionDenied
 
-        cls.create_module_plugin(name=name, category=category, plugins=plugins)
+        content_hash = get_content_hash(plugins)
+        duplicate = cls.get_duplicate_module(category=category, content_hash=content_hash)
+
+        if duplicate and not create_form.cleaned_data.get('allow_duplicate'):
+            # Links to the existing module instead of silently duplicating it
+            create_form.add_duplicate_error(duplicate, url=get_modules_list_url() + f'#cms-plugin-{duplicate.pk}')
+            return cls.render_create_module_form(request, create_form)
+
+        cls.create_module_plugin(name=name, category=category, plugins=plugins, content_hash=content_hash)
         return HttpResponse('<div><div class="messagelist"><div class="success"></div></div></div>')
 
+    @classmethod
+    def send_pre_add_module_operation(cls, request, module_plugin, placeholder, language, parent=None, position=None):
+        tree_order = placeholder.get_plugin_tree_order(language=language, parent_id=parent)
+
+        # This is needed only because we of the operation signal requiring
+        # a version of the plugin that's not been committed to the db yet.
+        new_module_plugin = copy.copy(module_plugin)
+        new_module_plugin.pk = None
+        new_module_plugin.placeholder = placeholder
+        new_module_plugin.parent = None
+        new_module_plugin.position = len(tree_order) if position is None else min(position, len(tree_order))
+
+        m_admin = module_plugin.placeholder._get_attached_admin()
+        return m_admin._send_pre_placeholder_operation(
+            request=request,
+            placeholder=placeholder,
+            tree_order=tree_order,
+            operation=operations.ADD_PLUGIN,
+            plugin=new_module_plugin,
+        )
+
     @classmethod
     def add_module_view(cls, request, module_id):
         if not request.user.is_staff:
             raise PermissionDenied
 
+        from .forms import AddModuleForm
+
         module_plugin = get_object_or_404(cls.model, pk=module_id)
 
         if request.method == 'GET':
@@ -228,43 +362,46 @@ class Module(CMSPluginBase):
         except PluginLimitReached as er:
             return HttpResponseBadRequest(er)
 
-        tree_order = target_placeholder.get_plugin_tree_order(
-            language=language,
-            parent_id=target_plugin,
-        )
-
+        position = form.cleaned_data.get('target_position')
         m_admin = module_plugin.placeholder._get_attached_admin()
+        retries = getattr(settings, 'DJANGOCMS_MODULES_INSERT_RETRIES', 3)
+
+        for attempt in range(retries + 1):
+            try:
+                with transaction.atomic():
+                    # The operation is announced within the attempt, so that what its
+                    # handlers (e.g. djangocms-history) write is rolled back with a
+                    # failed attempt and only the applied module is followed by the
+                    # post operation.
+                    operation_token = cls.send_pre_add_module_operation(
+                        request,
+                        module_plugin,
+                        placeholder=target_placeholder,
+                        language=language,
+                        parent=target_plugin,
+                        position=position,
+                    )
+                    new_module_plugin = cls.insert_module_plugin(
+                        module_plugin,
+                        placeholder=target_placeholder,
+                        language=language,
+                        parent=target_plugin,
+                        position=position,
+                    )
+            except (ConcurrentModification, IntegrityError):
+                # Another editor changed the placeholder, start over
+                continue
+            break
+        else:
+            return HttpResponse(
+                force_str(_('The placeholder has been changed by another user, please try again.')),
+                status=409,
+            )
 
-        # This is needed only because we of the operation signal requiring
-        # a version of the plugin that's not been committed to the db yet.
-        new_module_plugin = copy.copy(module_plugin)
-        new_module_plugin.pk = None
-        new_module_plugin.placeholder = target_placeholder
-        new_module_plugin.parent = None
-        new_module_plugin.position = len(tree_order) + 1
-
-        operation_token = m_admin._send_pre_placeholder_operation(
-            request=request,
-            placeholder=target_placeholder,
-            tree_order=tree_order,
-            operation=operations.ADD_PLUGIN,
-            plugin=new_module_plugin,
-        )
-
-        new_plugins = copy_plugins_to_placeholder(
-            plugins=list(module_plugin.get_unbound_plugins()),
-            placeholder=target_placeholder,
+        tree_order = target_placeholder.get_plugin_tree_order(
             language=language,
-            root_plugin=target_plugin,
-        )
-        tree_order.append(new_plugins[0].pk)
-        reorder_plugins(
-            target_placeholder,
             parent_id=target_plugin,
-            language=language,
-            order=tree_order,
         )
-        new_module_plugin = cls.model.objects.get(pk=new_plugins[0].pk)
 
         m_admin._send_post_placeholder_operation(
             request,
@@ -275,6 +412,7 @@ class Module(CMSPluginBase):
             tree_order=tree_order,
         )
 
+        count_module_usage(module_plugin.pk, APPLIED)
         response = cls().render_close_frame(request, obj=new_module_plugin)
 
         if form.cleaned_data.get('disable_future_confirmation'):
@@ -286,13 +424,120 @@ class Module(CMSPluginBase):
         if not request.user.is_staff:
             raise PermissionDenied
 
+        categories = Category.objects.order_by('name')
+
+        if getattr(settings, 'DJANGOCMS_MODULES_PREFETCH_PLUGINS', True):
+            categories = list(categories)
+            prefetch_module_plugins(request, categories, language=settings.LANGUAGE_CODE)
+
         view = ListView.as_view(
             model=Category,
             context_object_name='categories',
-            queryset=Category.objects.order_by('name'),
+            queryset=categories,
             template_name='djangocms_modules/modules_list.html',
         )
         return view(request)
 
+    @classmethod
+    def get_modules_catalog(cls, language=None, ordering=None):
+        """
+        Returns all categories with their non-empty modules,
+        as shown in the "add plugin" menu.
+
+        Modules are listed in the given language, falling back
+        to the default language for modules without a variant.
+        With the "popularity" ordering, the most applied modules
+        of each category are listed first.
+        """
+        languages = {settings.LANGUAGE_CODE, language or settings.LANGUAGE_CODE}
+        modules = (
+            cls
+            .model
+            .get_library_modules()
+            .filter(language__in=languages, numchild__gte=1)
+            .annotate(
+                applied=Coalesce('usage__applied', 0),
+                previewed=Coalesce('usage__previewed', 0),
+            )
+            .order_by('path')
+        )
+        variants = {}
+
+        for module in modules:
+            # Variants are listed in place of their source module
+            key = module.source_module_id or module.pk
+
+            if key not in variants or module.language == language:
+                variants[key] = module
+
+        modules_by_category = {}
+
+        for module in variants.values():
+            modules_by_category.setdefault(module.module_category_id, []).append({
+                'id': module.pk,
+                'name': module.module_name,
+                'plugin_type': module.plugin_type,
+                'add_url': get_add_module_url(module.pk),
+                'preview_url': get_module_preview_url(module.pk),
+                'applied': module.applied,
+                'previewed': module.previewed,
+            })
+
+        if ordering == 'popularity':
+            for category_modules in modules_by_category.values():
+                category_modules.sort(key=itemgetter('applied'), reverse=True)
+
+        catalog = [
+            {
+                'id': category.pk,
+                'name': category.name,
+                'modules': modules_by_category.get(category.pk, []),
+            }
+            for category in get_module_categories()
+        ]
+        return catalog
+
+    @classmethod
+    def modules_catalog_view(cls, request):
+        if not request.user.is_staff:
+            raise PermissionDenied
+
+        language = request.GET.get('language')
+
+        if language not in dict(settings.LANGUAGES):
+            language = get_language_from_request(request, check_path=True)
+
+        ordering = request.GET.get('ordering', getattr(settings, 'DJANGOCMS_MODULES_CATALOG_ORDERING', None))
+        catalog = cls.get_modules_catalog(language=language, ordering=ordering)
+        return JsonResponse({'categories': catalog})
+
+    @classmethod
+    def module_preview_view(cls, request, module_id):
+        from .previews import get_module_preview
+        from .rendering import get_module_fingerprint
+
+        if not request.user.is_staff:
+            raise PermissionDenied
+
+        module_plugin = get_object_or_404(cls.model, pk=module_id)
+        fingerprint = get_module_fingerprint(module_plugin)
+        etag = f'"{fingerprint}"'
+
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponse(status=304)
+        else:
+            # Previews are rendered offline by the "render_module_previews" command
+            preview = get_module_preview(module_plugin, fingerprint=fingerprint)
+
+            if preview is None:
+                raise Http404('No preview has been rendered for this module')
+            response = HttpResponse(preview)
+
+        count_module_usage(module_plugin.pk, PREVIEWED)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Cookie'])
+        return response
+
 
 plugin_pool.register_plugin(Module)
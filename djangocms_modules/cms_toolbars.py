@@ -18,7 +18,11 @@ class ModulesToolbar(CMSToolbar):
     """
 
     class Media:
-        js = ('djangocms_modules/js/dist/bundle.modules.min.js',)
+        js = (
+            'djangocms_modules/js/dist/bundle.modules.min.js',
+            # Not bundled, shares a single modules list between the "add plugin" menus
+            'djangocms_modules/js/modules-menu.js',
+        )
         css = {
             'all': ('djangocms_modules/css/modules.css',)
         }
@@ -2,6 +2,7 @@ from django import forms
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.admin.widgets import AdminTextInputWidget, RelatedFieldWidgetWrapper
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
 from cms.models import CMSPlugin, Placeholder
@@ -9,6 +10,11 @@ from cms.models import CMSPlugin, Placeholder
 from .models import Category, ModulePlugin
 
 
+def get_language_choices():
+    # Resolved when the form is instantiated, not when it is imported
+    return settings.LANGUAGES
+
+
 class NewModuleForm(forms.Form):
     plugin = forms.ModelChoiceField(
         CMSPlugin.objects.exclude(plugin_type='Module'),
@@ -21,7 +27,7 @@ class NewModuleForm(forms.Form):
         widget=forms.HiddenInput(),
     )
     language = forms.ChoiceField(
-        choices=settings.LANGUAGES,
+        choices=get_language_choices,
         required=True,
         widget=forms.HiddenInput(),
     )
@@ -50,6 +56,20 @@ class CreateModuleForm(NewModuleForm):
         queryset=Category.objects.all(),
         required=True,
     )
+    allow_duplicate = forms.BooleanField(
+        label=_('Create anyway'),
+        required=False,
+        widget=forms.HiddenInput(),
+    )
+
+    def add_duplicate_error(self, module, url):
+        message = format_html(
+            _('An identical module <a href="{url}" target="_top">{name}</a> already exists in this category.'),
+            url=url,
+            name=module.module_name,
+        )
+        self.fields['allow_duplicate'].widget = forms.CheckboxInput()
+        self.add_error(None, message)
 
     def set_category_widget(self, request):
         related_modeladmin = admin.site._registry.get(Category)
@@ -83,7 +103,7 @@ class AddModuleForm(forms.Form):
         widget=forms.HiddenInput(),
     )
     target_language = forms.ChoiceField(
-        choices=settings.LANGUAGES,
+        choices=get_language_choices,
         required=True,
         widget=forms.HiddenInput(),
     )
@@ -92,6 +112,11 @@ class AddModuleForm(forms.Form):
         required=False,
         widget=forms.HiddenInput(),
     )
+    target_position = forms.IntegerField(
+        min_value=0,
+        required=False,
+        widget=forms.HiddenInput(),
+    )
     disable_future_confirmation = forms.BooleanField(required=False, initial=False)
 
     def clean(self):
@@ -1,6 +1,5 @@
 import json
 
-from django.apps import apps
 from django.urls import Resolver404, resolve
 
 from cms import operations
@@ -9,6 +8,85 @@ from cms.models import CMSPlugin
 from .models import Category, ModulePlugin
 
 
+def sync_module_plugin(sender, **kwargs):
+    """
+    Updates the created placeholder operation record,
+    based on the configured post operation handlers.
+    """
+    operation_type = kwargs.pop('operation')
+    affected_operations = (operations.MOVE_PLUGIN, operations.PASTE_PLUGIN)
+
+    if operation_type not in affected_operations:
+        return
+
+    try:
+        match = resolve(kwargs['origin'])
+    except Resolver404:
+        match = None
+
+    is_in_modules = match and match.url_name == 'cms_modules_list'
+
+    if not is_in_modules:
+        return
+
+    plugin = kwargs['plugin']
+    placeholder = kwargs.get('target_placeholder')
+    needs_sync = (
+        plugin.plugin_type
+        == 'Module'
+        and placeholder.pk
+        != plugin.module_category.modules_id
+    )
+
+    if needs_sync:
+        # User has moved module to another category placeholder
+        # or pasted a copied module plugin.
+        new_category = Category.objects.get(modules=placeholder)
+        (ModulePlugin
+         .objects
+         .filter(path__startswith=plugin.path, depth__gte=plugin.depth)
+         .update(module_category=new_category))
+
+
+def refresh_module_content_hash(sender, **kwargs):
+    """
+    Refreshes the content hash of the modules whose plugins
+    have been added, changed, moved or deleted.
+    """
+    try:
+        match = resolve(kwargs['origin'])
+    except Resolver404:
+        match = None
+
+    is_in_modules = match and match.url_name == 'cms_modules_list'
+
+    if not is_in_modules:
+        return
+
+    placeholders = [kwargs.get(name) for name in ('placeholder', 'source_placeholder', 'target_placeholder')]
+    placeholder_ids = {placeholder.pk for placeholder in placeholders if placeholder}
+
+    plugins = [kwargs.get('plugin'), kwargs.get('new_plugin'), *kwargs.get('plugins', [])]
+    paths = {plugin.path for plugin in plugins if plugin}
+    # A plugin moved out of a module changes the content of the module
+    parent_ids = {kwargs.get('source_parent_id'), kwargs.get('target_parent_id')} - {None}
+    paths.update(CMSPlugin.objects.filter(pk__in=parent_ids).values_list('path', flat=True))
+    modules = ModulePlugin.get_library_modules().filter(
+        placeholder__in=placeholder_ids,
+        path__in={path[:CMSPlugin.steplen] for path in paths},
+    )
+    changed = []
+
+    for module in modules:
+        content_hash = module.get_content_hash()
+
+        if content_hash != module.content_hash:
+            module.content_hash = content_hash
+            changed.append(module)
+
+    ModulePlugin.objects.bulk_update(changed, ['content_hash'])
+
+
 def sync_module_category(sender, **kwargs):
     from djangocms_history.actions import MOVE_IN_PLUGIN, MOVE_OUT_PLUGIN
 
@@ -55,17 +133,3 @@ def sync_module_category(sender, **kwargs):
          .objects
          .filter(path__startswith=root_plugin.path, depth__gte=root_plugin.depth)
          .update(module_category=new_category))
-
-
-if apps.is_installed('djangocms_history'):
-    from djangocms_history import signals
-
-    signals.post_operation_undo.connect(
-        sync_module_category,
-        dispatch_uid='undo_sync_module_category',
-    )
-
-    signals.post_operation_redo.connect(
-        sync_module_category,
-        dispatch_uid='redo_sync_module_category',
-    )
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.safestring import mark_safe
+from django.utils.text import slugify
+
+from sekizai.context import SekizaiContext
+from sekizai.helpers import get_varname
+
+from djangocms_modules.models import Category
+from djangocms_modules.rendering import get_synthetic_request, get_tree_fingerprint, render_module
+
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Renders the modules of each category as static html files, '
+        'categories which have not changed since the last build are skipped'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help='Directory the html files are written to.')
+        parser.add_argument(
+            '--language',
+            default=settings.LANGUAGE_CODE,
+            choices=[code for code, name in settings.LANGUAGES],
+            help='Language of the modules, defaults to the default language.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Renders all categories, even if they have not changed.',
+        )
+
+    def handle(self, *args, **options):
+        output_dir = options['output_dir']
+        language = options['language']
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = {} if options['force'] else self.read_manifest(output_dir)
+        new_manifest = {}
+        index = []
+        rendered = 0
+
+        with translation.override(language):
+            # Only one category is loaded and rendered at a time
+            for category in Category.objects.order_by('name').iterator():
+                fingerprint = self.get_fingerprint(category, language)
+                filename = f'{slugify(category.name) or "category"}-{category.pk}.html'
+                entry = {'name': category.name, 'filename': filename, 'fingerprint': fingerprint}
+                is_current = (
+                    manifest.get(str(category.pk)) == entry
+                    and os.path.exists(os.path.join(output_dir, filename))
+                )
+
+                if not is_current:
+                    self.write_category(category, language, os.path.join(output_dir, filename))
+                    rendered += 1
+
+                new_manifest[str(category.pk)] = entry
+                index.append(entry)
+
+            self.write_file(
+                os.path.join(output_dir, 'index.html'),
+                render_to_string('djangocms_modules/styleguide_index.html', {
+                    'categories': index,
+                    'language': language,
+                }),
+            )
+
+        # Removes the files of deleted or renamed categories
+        filenames = {entry['filename'] for entry in new_manifest.values()}
+
+        for entry in manifest.values():
+            path = os.path.join(output_dir, entry['filename'])
+
+            if entry['filename'] not in filenames and os.path.exists(path):
+                os.remove(path)
+
+        self.write_file(os.path.join(output_dir, MANIFEST_NAME), json.dumps(new_manifest, indent=2))
+        self.stdout.write(
+            'Successfully rendered "%d" module categories, "%d" were up to date.'
+            % (rendered, len(index) - rendered)
+        )
+
+    def read_manifest(self, output_dir):
+        try:
+            with open(os.path.join(output_dir, MANIFEST_NAME)) as manifest:
+                return json.load(manifest)
+        except (OSError, ValueError):
+            return {}
+
+    def get_fingerprint(self, category, language):
+        plugins = get_tree_fingerprint(category.modules.get_plugins(language))
+        return hashlib.sha1(f'{category.name}:{plugins}'.encode('utf-8')).hexdigest()
+
+    def write_category(self, category, language, path):
+        # A new request per category, as the renderer keeps track of
+        # every placeholder (and its plugins) it has rendered.
+        request = get_synthetic_request(language=language)
+        # The synthetic request is anonymous, the placeholder cache might
+        # still hold the content of the previous build.
+        category.modules.clear_cache(language)
+        # Modules are written one at a time, the page around them is rendered
+        # last, with the css and js the plugins of the modules have added.
+        modules_context = SekizaiContext({
+            'request': request,
+            'modules_page': True,
+            'category_name': category.name,
+        })
+        modules = category.modules.get_plugins(language).filter(parent__isnull=True).order_by('position')
+        modules_path = f'{path}.modules.tmp'
+
+        with open(modules_path, 'w', encoding='utf-8') as output:
+            for module in modules.iterator():
+                output.write(render_module(module, request=request, context=modules_context))
+
+        marker = f'<!-- modules {uuid.uuid4().hex} -->'
+        context = {
+            'categories': [category],
+            'modules_language': language,
+            'rendered_modules': mark_safe(marker),
+            get_varname(): modules_context[get_varname()],
+        }
+        page = render_to_string('djangocms_modules/modules_list.html', context, request=request)
+        head, tail = page.split(marker, 1)
+        temp_path = f'{path}.tmp'
+
+        with open(temp_path, 'w', encoding='utf-8') as output, open(modules_path, encoding='utf-8') as modules_file:
+            output.write(head)
+            shutil.copyfileobj(modules_file, output)
+            output.write(tail)
+        os.remove(modules_path)
+        os.replace(temp_path, path)
+
+    def write_file(self, path, content):
+        # Written to a temporary file first, so that the previous
+        # version is served until the new one is complete.
+        temp_path = f'{path}.tmp'
+
+        with open(temp_path, 'w', encoding='utf-8') as output:
+            output.write(content)
+        os.replace(temp_path, path)
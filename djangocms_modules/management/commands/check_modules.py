@@ -0,0 +1,173 @@
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cms.models import CMSPlugin
+
+from djangocms_modules.models import Category, ModulePlugin
+
+
+PROBLEMS = (
+    ('category', 'Plugins with a wrong module category'),
+    ('unbound', 'Modules without a module instance'),
+    ('empty', 'Empty modules'),
+    ('language', 'Plugins with a different language than their module'),
+    ('unknown_language', 'Modules in a language which is not configured'),
+    ('numchild', 'Plugins with a wrong number of children'),
+    ('depth', 'Plugins with a wrong depth'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Checks the plugin trees of all module categories for inconsistencies '
+        'and optionally repairs them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Repairs the problems found instead of only reporting them.',
+        )
+        parser.add_argument(
+            '--delete-empty',
+            action='store_true',
+            help='Deletes empty modules and modules without a module instance when repairing.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=100,
+            help='Number of module categories checked at once.',
+        )
+
+    def handle(self, *args, **options):
+        self.found = Counter()
+        self.fixed = Counter()
+        self.timings = Counter()
+        categories = Category.objects.order_by('pk').values_list('modules_id', 'pk')
+        chunk = {}
+        count = 0
+
+        for placeholder_id, category_id in categories.iterator():
+            chunk[placeholder_id] = category_id
+
+            if len(chunk) == options['chunk_size']:
+                self.check_chunk(chunk, fix=options['fix'], delete_empty=options['delete_empty'])
+                count += len(chunk)
+                chunk = {}
+
+        if chunk:
+            self.check_chunk(chunk, fix=options['fix'], delete_empty=options['delete_empty'])
+            count += len(chunk)
+
+        self.stdout.write(
+            'Checked "%d" module categories and "%d" plugins in %.2fs (%.2fs scanning, %.2fs fixing).'
+            % (count, self.found['plugins'], self.timings['scan'] + self.timings['fix'],
+               self.timings['scan'], self.timings['fix'])
+        )
+
+        for problem, label in PROBLEMS:
+            if options['fix']:
+                self.stdout.write('%s: %d found, %d fixed.' % (label, self.found[problem], self.fixed[problem]))
+            else:
+                self.stdout.write('%s: %d found.' % (label, self.found[problem]))
+
+    def check_chunk(self, categories_by_placeholder, fix=False, delete_empty=False):
+        start = time.monotonic()
+        plugins, fixes = self.scan_chunk(categories_by_placeholder)
+        self.found['plugins'] += len(plugins)
+
+        for problem, values in fixes.items():
+            self.found[problem] += sum(len(pks) for pks in values.values())
+
+        self.timings['scan'] += time.monotonic() - start
+
+        if fix and fixes:
+            start = time.monotonic()
+
+            with transaction.atomic():
+                # The plugins might have been changed since they have been scanned,
+                # they are scanned again and locked until they have been fixed.
+                _, fixes = self.scan_chunk(categories_by_placeholder, lock=True)
+                self.fix_chunk(fixes, delete_empty=delete_empty)
+            self.timings['fix'] += time.monotonic() - start
+
+    def scan_chunk(self, categories_by_placeholder, lock=False):
+        """
+        Returns the plugins of the given categories and their problems,
+        as {problem: {correct value: [plugin ids]}}.
+        """
+        steplen = CMSPlugin.steplen
+        plugins = CMSPlugin.objects.filter(placeholder__in=categories_by_placeholder)
+        modules = ModulePlugin.objects.filter(placeholder__in=categories_by_placeholder)
+
+        if lock:
+            plugins = plugins.select_for_update()
+            modules = modules.select_for_update()
+
+        plugins = list(
+            plugins
+            .order_by('path')
+            .values_list('pk', 'placeholder_id', 'path', 'depth', 'numchild', 'language', 'plugin_type')
+        )
+        module_categories = dict(modules.values_list('pk', 'module_category_id'))
+        children = Counter(path[:-steplen] for pk, _, path, depth, *_ in plugins if depth > 1)
+        root_languages = {path: language for pk, _, path, depth, _, language, _ in plugins if depth == 1}
+        languages = {code for code, name in settings.LANGUAGES}
+        fixes = defaultdict(lambda: defaultdict(list))
+
+        for pk, placeholder_id, path, depth, numchild, language, plugin_type in plugins:
+            category_id = categories_by_placeholder[placeholder_id]
+            root_language = root_languages.get(path[:steplen])
+
+            if plugin_type == 'Module' and pk in module_categories and module_categories[pk] != category_id:
+                fixes['category'][category_id].append(pk)
+
+            if depth == 1 and plugin_type == 'Module' and pk not in module_categories:
+                fixes['unbound'][None].append(pk)
+            elif depth == 1 and plugin_type == 'Module' and not children[path]:
+                fixes['empty'][None].append(pk)
+
+            if depth == 1 and language not in languages:
+                # Only reported
+                fixes['unknown_language'][None].append(pk)
+
+            if root_language and language != root_language:
+                fixes['language'][root_language].append(pk)
+
+            if numchild != children[path]:
+                fixes['numchild'][children[path]].append(pk)
+
+            if depth != len(path) // steplen:
+                fixes['depth'][len(path) // steplen].append(pk)
+        return plugins, fixes
+
+    def fix_chunk(self, fixes, delete_empty=False):
+        # One update per problem and correct value
+        for category_id, pks in fixes['category'].items():
+            self.fixed['category'] += ModulePlugin.objects.filter(pk__in=pks).update(module_category=category_id)
+
+        for language, pks in fixes['language'].items():
+            self.fixed['language'] += CMSPlugin.objects.filter(pk__in=pks).update(language=language)
+
+        for numchild, pks in fixes['numchild'].items():
+            self.fixed['numchild'] += CMSPlugin.objects.filter(pk__in=pks).update(numchild=numchild)
+
+        for depth, pks in fixes['depth'].items():
+            self.fixed['depth'] += CMSPlugin.objects.filter(pk__in=pks).update(depth=depth)
+
+        if not delete_empty:
+            return
+
+        # Only modules (root plugins) are deleted, together with their descendants
+        for problem in ('unbound', 'empty'):
+            pks = fixes[problem][None]
+
+            if pks:
+                CMSPlugin.objects.filter(pk__in=pks).delete()
+                self.fixed[problem] += len(pks)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from djangocms_modules.usage import flush_module_usage
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes the usage counts of modules from the cache to the database, '
+        'run it periodically (e.g. every few minutes)'
+    )
+
+    def handle(self, *args, **options):
+        count = flush_module_usage()
+        self.stdout.write('Successfully updated the usage of "%d" modules.' % count)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from djangocms_modules.models import ModulePlugin
+from djangocms_modules.previews import has_module_preview, save_module_preview
+from djangocms_modules.rendering import get_module_fingerprint, get_synthetic_request
+
+
+class Command(BaseCommand):
+    help = 'Renders and caches the preview of each module'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Renders all previews, even if their module has not changed.',
+        )
+
+    def handle(self, *args, **options):
+        rendered = 0
+        skipped = 0
+        requests = {}
+        modules = ModulePlugin.get_library_modules().select_related('placeholder').order_by('pk')
+
+        for module in modules.iterator():
+            fingerprint = get_module_fingerprint(module)
+
+            if not options['force'] and has_module_preview(module, fingerprint=fingerprint):
+                skipped += 1
+                continue
+
+            if module.language not in requests:
+                requests[module.language] = get_synthetic_request(language=module.language)
+
+            save_module_preview(module, fingerprint=fingerprint, request=requests[module.language])
+            rendered += 1
+
+        self.stdout.write(
+            'Successfully rendered "%d" module previews, "%d" were up to date.' % (rendered, skipped)
+        )
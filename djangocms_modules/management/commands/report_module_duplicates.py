@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from djangocms_modules.models import ModulePlugin
+
+
+class Command(BaseCommand):
+    help = 'Lists modules with identical content, across all categories'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-update',
+            action='store_true',
+            help='Uses the stored content hashes instead of computing them again.',
+        )
+
+    def handle(self, *args, **options):
+        modules = ModulePlugin.get_library_modules()
+
+        if not options['skip_update']:
+            self.update_content_hashes(modules)
+
+        clusters = (
+            modules
+            .exclude(content_hash='')
+            .values('content_hash', 'language')
+            .annotate(count=Count('pk'))
+            .filter(count__gt=1)
+            .order_by('-count', 'content_hash')
+        )
+        duplicates = 0
+
+        for cluster in clusters.iterator():
+            cluster_modules = (
+                modules
+                .filter(content_hash=cluster['content_hash'], language=cluster['language'])
+                .select_related('module_category')
+                .order_by('module_category__name', 'path')
+            )
+            self.stdout.write(
+                '%d identical modules (%s, %s):' % (cluster['count'], cluster['language'], cluster['content_hash'][:8])
+            )
+
+            for module in cluster_modules:
+                self.stdout.write(f'  {module.module_category} / {module} (#{module.pk})')
+            duplicates += cluster['count'] - 1
+
+        self.stdout.write('Found "%d" duplicated modules.' % duplicates)
+
+    def update_content_hashes(self, modules, batch_size=100):
+        # Modules can be edited after they have been created
+        changed = []
+
+        for module in modules.order_by('pk').iterator():
+            content_hash = module.get_content_hash()
+
+            if content_hash != module.content_hash:
+                module.content_hash = content_hash
+                changed.append(module)
+
+        ModulePlugin.objects.bulk_update(changed, ['content_hash'], batch_size=batch_size)
@@ -0,0 +1,260 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cms.models import CMSPlugin
+from cms.utils.plugins import copy_plugins_to_placeholder, get_bound_plugins
+
+from djangocms_modules.models import Category, ModulePlugin
+
+
+# Longest time copying a module may take
+COPY_DURATION = timedelta(minutes=1)
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies new and changed modules from the default language into the other '
+        'languages, only plugins which are missing or have changed since their last '
+        'sync are copied, plugins edited in the other language are kept and copies '
+        'of deleted modules are removed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            choices=[code for code, name in settings.LANGUAGES],
+            help='Language to sync, defaults to all languages but the default one. Can be repeated.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only reports the modules which would be copied or deleted.',
+        )
+
+    def handle(self, *args, **options):
+        source_language = settings.LANGUAGE_CODE
+        languages = options['languages'] or [code for code, name in settings.LANGUAGES]
+        languages = [language for language in languages if language != source_language]
+        counts = Counter()
+        categories = Category.objects.select_related('modules')
+
+        for category in categories.iterator():
+            for language in languages:
+                self.sync_category(category, source_language, language, counts, dry_run=options['dry_run'])
+
+        self.stdout.write(
+            'Successfully synced modules: "%d" created, "%d" updated, "%d" unchanged, "%d" deleted, '
+            '"%d" edited plugins kept.'
+            % (counts['created'], counts['updated'], counts['unchanged'], counts['deleted'], counts['kept'])
+        )
+
+    def get_synced_plugins(self, pairs):
+        """
+        Returns the sync state of the given (variant plugin id, source plugin id)
+        pairs, as stored in ``ModulePlugin.synced_plugins``.
+        """
+        plugin_ids = [plugin_id for pair in pairs for plugin_id in pair]
+        changed_dates = dict(CMSPlugin.objects.filter(pk__in=plugin_ids).values_list('pk', 'changed_date'))
+        return {
+            str(source_id): [variant_id, changed_dates[source_id].isoformat(), changed_dates[variant_id].isoformat()]
+            for variant_id, source_id in pairs
+        }
+
+    def pair_plugins(self, source_plugins, variant_plugins):
+        """
+        Pairs the plugins of a variant synced before its plugins were tracked
+        by their place in the tree. Such variants were copied at once, plugins
+        which have changed well after the copy are taken as changed since.
+        """
+        copied_at = min(plugin.changed_date for plugin in variant_plugins) + COPY_DURATION
+        children = defaultdict(list)
+
+        for plugin in source_plugins + variant_plugins:
+            children[plugin.parent_id].append(plugin)
+
+        synced_plugins = {}
+        pending = [(variant_plugins[0], source_plugins[0])]
+
+        while pending:
+            variant_plugin, source_plugin = pending.pop()
+            synced_plugins[str(source_plugin.pk)] = [
+                variant_plugin.pk,
+                source_plugin.changed_date.isoformat() if source_plugin.changed_date <= copied_at else '',
+                variant_plugin.changed_date.isoformat() if variant_plugin.changed_date <= copied_at else '',
+            ]
+            variant_children = sorted(children[variant_plugin.pk], key=attrgetter('position'))
+            source_children = sorted(children[source_plugin.pk], key=attrgetter('position'))
+
+            for variant_child, source_child in zip(variant_children, source_children):
+                if variant_child.plugin_type != source_child.plugin_type:
+                    break
+                pending.append((variant_child, source_child))
+        return synced_plugins
+
+    def copy_module(self, module, category, language):
+        source_plugins = list(module.get_unbound_plugins())
+        new_plugins = copy_plugins_to_placeholder(source_plugins, placeholder=category.modules, language=language)
+        pairs = [(new_plugin.pk, plugin.pk) for new_plugin, plugin in zip(new_plugins, source_plugins)]
+        CMSPlugin.objects.filter(pk=new_plugins[0].pk).update(position=module.position)
+        ModulePlugin.objects.filter(pk=new_plugins[0].pk).update(
+            source_module=module,
+            synced_plugins=self.get_synced_plugins(pairs),
+        )
+
+    def copy_content(self, source, target):
+        """
+        Copies the content of a (bound) plugin into another one of the same type.
+        """
+        for field in source._meta.concrete_fields:
+            if field.model is not CMSPlugin and not field.primary_key:
+                setattr(target, field.attname, field.value_from_object(source))
+        target.save()
+
+    def sync_variant(self, module, variant, counts, dry_run=False):
+        """
+        Copies the plugins of the module which are missing in the variant or have
+        changed since their last copy. Plugins which have been edited in the
+        variant since then are kept. Returns whether the variant was changed.
+        """
+        source_plugins = list(module.get_unbound_plugins())
+        variant_plugins = {plugin.pk: plugin for plugin in variant.get_unbound_plugins()}
+        synced_plugins = variant.synced_plugins or self.pair_plugins(source_plugins, list(variant_plugins.values()))
+        paired = {}
+        missing = []
+        changed = []
+        moved = []
+        renamed = False
+
+        for plugin in source_plugins:
+            variant_id, source_date, variant_date = synced_plugins.get(str(plugin.pk), (None, None, None))
+            variant_plugin = variant_plugins.pop(variant.pk if plugin.pk == module.pk else variant_id, None)
+
+            if variant_plugin is None:
+                missing.append(plugin)
+                continue
+
+            paired[plugin.pk] = variant_plugin
+            edited = variant_plugin.changed_date.isoformat() != variant_date
+
+            if plugin.pk == module.pk:
+                # Modules are renamed through a queryset update, which keeps their changed date
+                if variant.module_name != module.module_name:
+                    renamed = not edited
+                    counts['kept'] += edited
+            elif plugin.changed_date.isoformat() != source_date:
+                if edited:
+                    counts['kept'] += 1
+                else:
+                    changed.append((variant_plugin, plugin))
+
+            if plugin.pk != module.pk and variant_plugin.position != plugin.position:
+                moved.append((variant_plugin, plugin))
+
+        # Plugins paired with a plugin which has been deleted from the module,
+        # plugins which have been edited or added in the variant are kept.
+        removed = []
+
+        for source_id, (variant_id, source_date, variant_date) in synced_plugins.items():
+            variant_plugin = variant_plugins.get(variant_id)
+
+            if variant_plugin is None:
+                continue
+
+            if variant_plugin.changed_date.isoformat() == variant_date:
+                removed.append(variant_id)
+            else:
+                counts['kept'] += 1
+
+        has_changes = bool(renamed or missing or changed or moved or removed)
+
+        if dry_run or not (has_changes or not variant.synced_plugins):
+            return has_changes
+
+        if renamed:
+            variant.update(module_name=module.module_name)
+
+        for variant_plugin, plugin in moved:
+            CMSPlugin.objects.filter(pk=variant_plugin.pk).update(position=plugin.position)
+
+        source_instances = {plugin.pk: plugin for plugin in get_bound_plugins(missing + [p for _, p in changed])}
+        variant_instances = {plugin.pk: plugin for plugin in get_bound_plugins([p for p, _ in changed])}
+        copied = []
+
+        for variant_plugin, plugin in changed:
+            self.copy_content(source_instances[plugin.pk], variant_instances[variant_plugin.pk])
+            copied.append((variant_plugin.pk, plugin.pk))
+
+        # Parents come before their children
+        for plugin in missing:
+            new_plugins = copy_plugins_to_placeholder(
+                [source_instances[plugin.pk]],
+                placeholder=variant.placeholder,
+                language=variant.language,
+                root_plugin=paired[plugin.parent_id],
+            )
+            paired[plugin.pk] = new_plugins[0]
+            copied.append((new_plugins[0].pk, plugin.pk))
+
+        if copied:
+            # Lets plugins referencing other plugins (eg. text plugins) update
+            # their references once all of their plugins have been copied.
+            source_instances = {plugin.pk: plugin for plugin in get_bound_plugins(source_plugins)}
+            variant_instances = {plugin.pk: plugin for plugin in get_bound_plugins(list(paired.values()))}
+            new_old_ziplist = [
+                (variant_instances[variant_plugin.pk], source_instances[source_id])
+                for source_id, variant_plugin in paired.items()
+                if variant_plugin.pk in variant_instances and source_id in source_instances
+            ]
+
+            for variant_id, source_id in copied:
+                variant_instances[variant_id].post_copy(source_instances[source_id], new_old_ziplist)
+
+        if removed:
+            CMSPlugin.objects.filter(pk__in=removed).delete()
+
+        # Pairs which have not been copied keep their state, so that
+        # plugins edited in the variant are still told apart.
+        synced_plugins = {
+            str(source_id): synced_plugins[str(source_id)]
+            for source_id in paired
+            if str(source_id) in synced_plugins
+        }
+        synced_plugins.update(self.get_synced_plugins(copied))
+        variant.update(synced_plugins=synced_plugins)
+        return has_changes
+
+    def sync_category(self, category, source_language, language, counts, dry_run=False):
+        modules = ModulePlugin.get_library_modules().filter(module_category=category).order_by('path')
+        variants = defaultdict(list)
+
+        for variant in modules.filter(language=language, source_module__isnull=False):
+            variants[variant.source_module_id].append(variant)
+
+        for module in modules.filter(language=source_language):
+            variant = variants[module.pk].pop(0) if variants[module.pk] else None
+
+            if variant is None:
+                counts['created'] += 1
+
+                if not dry_run:
+                    with transaction.atomic():
+                        self.copy_module(module, category, language)
+                continue
+
+            with transaction.atomic():
+                changed = self.sync_variant(module, variant, counts, dry_run=dry_run)
+            counts['updated' if changed else 'unchanged'] += 1
+
+        # Variants of modules which have been deleted
+        orphans = [variant.pk for source_variants in variants.values() for variant in source_variants]
+        counts['deleted'] += len(orphans)
+
+        if orphans and not dry_run:
+            CMSPlugin.objects.filter(pk__in=orphans).delete()
@@ -1,19 +1,40 @@
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from djangocms_modules.models import Category
+from cms.models import CMSPlugin
+
+from djangocms_modules.models import Category, ModulePlugin
 
 
 class Command(BaseCommand):
-    help = 'Updates the language for each plugin in a module category'
+    help = (
+        'Updates the language for each plugin in a module category. '
+        'Module variants in other languages are left as they are, '
+        'use "sync_module_languages" to keep them up to date.'
+    )
 
     def handle(self, *args, **options):
         count = 0
+        skipped = 0
         language = settings.LANGUAGE_CODE
         categories = Category.objects.select_related('modules')
 
         for category in categories.iterator():
             count += 1
-            category.modules.cmsplugin_set.update(language=language)
+            modules = ModulePlugin.get_library_modules().filter(module_category=category)
+
+            if not modules.filter(source_module__isnull=False).exists():
+                category.modules.cmsplugin_set.update(language=language)
+                continue
+
+            # Moving the plugins of a variant into the default language
+            # would turn it into a duplicate of its source module.
+            for module in modules.only('path', 'depth', 'source_module').iterator():
+                if module.source_module_id:
+                    skipped += 1
+                else:
+                    CMSPlugin.get_tree(module).update(language=language)
 
-        self.stdout.write('Successfully updated "%d" module categories.' % count)
+        self.stdout.write(
+            'Successfully updated "%d" module categories, skipped "%d" module variants.' % (count, skipped)
+        )
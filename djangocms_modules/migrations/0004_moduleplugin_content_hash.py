@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_modules', '0003_alter_moduleplugin_cmsplugin_ptr'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moduleplugin',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=40, verbose_name='Content hash'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_modules', '0004_moduleplugin_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModuleUsage',
+            fields=[
+                ('module', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='djangocms_modules.moduleplugin', verbose_name='Module')),
+                ('applied', models.PositiveIntegerField(default=0, verbose_name='Applied')),
+                ('previewed', models.PositiveIntegerField(default=0, verbose_name='Previewed')),
+            ],
+            options={
+                'verbose_name': 'Module usage',
+                'verbose_name_plural': 'Module usages',
+            },
+        ),
+    ]
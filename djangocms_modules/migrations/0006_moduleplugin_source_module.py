@@ -0,0 +1,55 @@
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def link_variants(apps, schema_editor):
+    """
+    Variants used to be paired with their source module by name,
+    links them to the first unpaired module with the same name.
+    """
+    ModulePlugin = apps.get_model('djangocms_modules', 'ModulePlugin')
+    modules = (
+        ModulePlugin
+        .objects
+        .filter(placeholder=models.F('module_category__modules'), parent__isnull=True)
+        .order_by('path')
+    )
+    sources = defaultdict(list)
+
+    for module in modules.filter(language=settings.LANGUAGE_CODE):
+        sources[(module.module_category_id, module.module_name)].append(module.pk)
+
+    variants = modules.exclude(language=settings.LANGUAGE_CODE).values_list(
+        'pk',
+        'language',
+        'module_category_id',
+        'module_name',
+    )
+    paired = defaultdict(int)
+
+    for pk, language, category_id, name in variants.iterator():
+        key = (category_id, name)
+        index = paired[(language, key)]
+
+        if index < len(sources[key]):
+            ModulePlugin.objects.filter(pk=pk).update(source_module=sources[key][index])
+            paired[(language, key)] += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_modules', '0005_moduleusage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moduleplugin',
+            name='source_module',
+            field=models.ForeignKey(blank=True, db_constraint=False, editable=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='djangocms_modules.moduleplugin', verbose_name='Source module'),
+        ),
+        migrations.RunPython(link_variants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_modules', '0006_moduleplugin_source_module'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moduleplugin',
+            name='synced_plugins',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Synced plugins'),
+        ),
+    ]
@@ -1,14 +1,13 @@
+import hashlib
+from operator import attrgetter
+
 from django.conf import settings
 from django.db import models
-from django.dispatch import receiver
-from django.urls import Resolver404, resolve
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
-from cms import operations
 from cms.models import CMSPlugin, Placeholder
 from cms.models.fields import PlaceholderField
-from cms.signals import pre_placeholder_operation
 from cms.utils.plugins import get_bound_plugins
 
 
@@ -16,45 +15,38 @@ def _get_placeholder_slot(category):
     return f'module-category-{category.pk}'
 
 
-@receiver(pre_placeholder_operation)
-def sync_module_plugin(sender, **kwargs):
+def get_content_hash(plugins):
     """
-    Updates the created placeholder operation record,
-    based on the configured post operation handlers.
+    Returns a hash of the content of the given (unbound) plugins,
+    independent of the placeholder, language and position they are in.
     """
-    operation_type = kwargs.pop('operation')
-    affected_operations = (operations.MOVE_PLUGIN, operations.PASTE_PLUGIN)
-
-    if operation_type not in affected_operations:
-        return
-
-    try:
-        match = resolve(kwargs['origin'])
-    except Resolver404:
-        match = None
-
-    is_in_modules = match and match.url_name == 'cms_modules_list'
-
-    if not is_in_modules:
-        return
-
-    plugin = kwargs['plugin']
-    placeholder = kwargs.get('target_placeholder')
-    needs_sync = (
-        plugin.plugin_type
-        == 'Module'
-        and placeholder.pk
-        != plugin.module_category.modules_id
-    )
-
-    if needs_sync:
-        # User has moved module to another category placeholder
-        # or pasted a copied module plugin.
-        new_category = Category.objects.get(modules=placeholder)
-        (ModulePlugin
-         .objects
-         .filter(path__startswith=plugin.path, depth__gte=plugin.depth)
-         .update(module_category=new_category))
+    plugins = sorted(plugins, key=attrgetter('path'))
+
+    if not plugins:
+        return ''
+
+    root_depth = min(plugin.depth for plugin in plugins)
+    bound_plugins = {plugin.pk: plugin for plugin in get_bound_plugins(plugins)}
+    indexes = {}
+    digest = hashlib.sha1()
+
+    for index, plugin in enumerate(plugins):
+        indexes[plugin.pk] = index
+        instance = bound_plugins.get(plugin.pk, plugin)
+        values = [
+            plugin.plugin_type,
+            plugin.depth - root_depth,
+            indexes.get(plugin.parent_id),
+            # The position of root plugins depends on where they were copied from
+            plugin.position if plugin.depth > root_depth else None,
+        ]
+        values.extend(
+            field.value_from_object(instance)
+            for field in instance._meta.concrete_fields
+            if field.model is not CMSPlugin and not field.primary_key and field.name != 'content_hash'
+        )
+        digest.update(repr(values).encode('utf-8'))
+    return digest.hexdigest()
 
 
 class Category(models.Model):
@@ -76,11 +68,11 @@ class Category(models.Model):
     def modules_placeholder(self):
         return ModulesPlaceholder.objects.get(pk=self.modules_id)
 
-    def get_non_empty_modules(self):
+    def get_non_empty_modules(self, language=None):
         unbound_plugins = (
             self
             .modules
-            .get_plugins(language=settings.LANGUAGE_CODE)
+            .get_plugins(language=language or settings.LANGUAGE_CODE)
             .filter(parent__isnull=True, numchild__gte=1)
         )
         return get_bound_plugins(unbound_plugins)
@@ -118,6 +110,37 @@ class ModulePlugin(CMSPlugin):
         verbose_name=_('Category'),
         on_delete=models.CASCADE,
     )
+    content_hash = models.CharField(
+        verbose_name=_('Content hash'),
+        max_length=40,
+        blank=True,
+        default='',
+        db_index=True,
+        editable=False,
+    )
+    # Set on the variants of a module in other languages. The link is kept
+    # (without a constraint) when the source module is deleted, so that
+    # "sync_module_languages" can tell its variants apart from modules
+    # which have been created in another language.
+    source_module = models.ForeignKey(
+        to='self',
+        verbose_name=_('Source module'),
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+    )
+    # Set on variants, pairs the plugins of the source module with the plugins
+    # of the variant as {source plugin id: [variant plugin id, changed date of
+    # the source plugin, changed date of the variant plugin]} at their last copy.
+    synced_plugins = models.JSONField(
+        verbose_name=_('Synced plugins'),
+        default=dict,
+        blank=True,
+        editable=False,
+    )
 
     def __str__(self):
         return self.module_name
@@ -130,3 +153,83 @@ class ModulePlugin(CMSPlugin):
 
     def get_unbound_plugins(self):
         return CMSPlugin.get_tree(self).order_by('path')
+
+    def get_content_hash(self):
+        return get_content_hash(self.get_unbound_plugins().exclude(pk=self.pk))
+
+    def get_duplicates(self):
+        """
+        Returns the modules of all categories with the same content.
+        """
+        if not self.content_hash:
+            return ModulePlugin.objects.none()
+
+        return (
+            ModulePlugin
+            .get_library_modules()
+            .filter(content_hash=self.content_hash, language=self.language)
+            .exclude(pk=self.pk)
+        )
+
+    def get_usage(self):
+        """
+        Returns the usage counters of this module,
+        which are not saved if the module has not been used yet.
+        """
+        try:
+            return self.usage
+        except ModuleUsage.DoesNotExist:
+            return ModuleUsage(module=self)
+
+    def get_variants(self):
+        """
+        Returns the variants of this module in other languages.
+        """
+        source_id = self.source_module_id or self.pk
+        return (
+            ModulePlugin
+            .get_library_modules()
+            .filter(models.Q(pk=source_id) | models.Q(source_module=source_id))
+            .exclude(language=self.language)
+        )
+
+    @classmethod
+    def get_library_modules(cls):
+        """
+        Returns the modules of all categories, excluding
+        modules which have been applied to a placeholder.
+        """
+        return cls.objects.filter(
+            placeholder=models.F('module_category__modules'),
+            parent__isnull=True,
+        )
+
+
+class ModuleUsage(models.Model):
+    """
+    Counts how often a module has been applied and previewed.
+    Counts are buffered by each process and written in bulk,
+    see ``djangocms_modules.usage``.
+    """
+    module = models.OneToOneField(
+        to=ModulePlugin,
+        verbose_name=_('Module'),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='usage',
+    )
+    applied = models.PositiveIntegerField(
+        verbose_name=_('Applied'),
+        default=0,
+    )
+    previewed = models.PositiveIntegerField(
+        verbose_name=_('Previewed'),
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = _('Module usage')
+        verbose_name_plural = _('Module usages')
+
+    def __str__(self):
+        return str(self.module)
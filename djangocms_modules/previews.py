@@ -0,0 +1,66 @@
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from .rendering import get_module_fingerprint, render_module, sanitize_html
+
+
+def get_preview_storage():
+    location = getattr(
+        settings,
+        'DJANGOCMS_MODULES_PREVIEWS_ROOT',
+        os.path.join(settings.MEDIA_ROOT, 'djangocms_modules', 'previews'),
+    )
+    return FileSystemStorage(location=location)
+
+
+def _get_preview_name(module, fingerprint):
+    return f'{module.pk}/{fingerprint}.html'
+
+
+def has_module_preview(module, fingerprint=None):
+    name = _get_preview_name(module, fingerprint or get_module_fingerprint(module))
+    return get_preview_storage().exists(name)
+
+
+def get_module_preview(module, fingerprint=None):
+    """
+    Returns the cached preview of the given module or None
+    if there's no preview for its current content.
+    """
+    storage = get_preview_storage()
+    name = _get_preview_name(module, fingerprint or get_module_fingerprint(module))
+
+    if not storage.exists(name):
+        return None
+
+    with storage.open(name) as preview:
+        return preview.read().decode('utf-8')
+
+
+def save_module_preview(module, fingerprint=None, request=None):
+    """
+    Renders the given module and stores its sanitised content,
+    replacing any preview of a previous version.
+    """
+    storage = get_preview_storage()
+    fingerprint = fingerprint or get_module_fingerprint(module)
+    name = _get_preview_name(module, fingerprint)
+    content = sanitize_html(render_module(module, request=request))
+
+    delete_module_previews(module, storage=storage)
+    storage.save(name, ContentFile(content.encode('utf-8')))
+    return content
+
+
+def delete_module_previews(module, storage=None):
+    storage = storage or get_preview_storage()
+    directory = str(module.pk)
+
+    if not storage.exists(directory):
+        return
+
+    for name in storage.listdir(directory)[1]:
+        storage.delete(f'{directory}/{name}')
@@ -0,0 +1,170 @@
+import hashlib
+import re
+from html import escape
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sites.models import Site
+from django.test import RequestFactory
+from django.utils import translation
+
+from cms.models import CMSPlugin
+from cms.toolbar.toolbar import EmptyToolbar
+from cms.utils.plugins import build_plugin_tree, downcast_plugins
+
+from sekizai.context import SekizaiContext
+
+
+# Browsers ignore ASCII whitespace and control characters in urls
+_url_ignored_characters = re.compile(r'[\x00-\x20\x7f]+')
+_url_scheme = re.compile(r'^([a-z][a-z0-9+.-]*):')
+
+
+def _is_safe_url(value):
+    # Relative urls have no scheme
+    match = _url_scheme.match(_url_ignored_characters.sub('', value).lower())
+    return not match or match.group(1) in _Sanitizer.safe_url_schemes
+
+
+class _Sanitizer(HTMLParser):
+    """
+    Keeps the allowed tags and attributes of the given html and escapes
+    everything else. The content of other tags is kept, except for the
+    tags which only contain code or embedded documents.
+    """
+    allowed_tags = (
+        'a', 'abbr', 'article', 'aside', 'b', 'blockquote', 'br', 'caption', 'cite', 'code', 'col', 'colgroup',
+        'dd', 'del', 'details', 'div', 'dl', 'dt', 'em', 'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4',
+        'h5', 'h6', 'header', 'hr', 'i', 'img', 'ins', 'kbd', 'li', 'main', 'mark', 'nav', 'ol', 'p', 'pre', 'q',
+        's', 'section', 'small', 'span', 'strong', 'sub', 'summary', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th',
+        'thead', 'time', 'tr', 'u', 'ul',
+    )
+    void_tags = ('br', 'col', 'hr', 'img')
+    # Removed with their content
+    unsafe_tags = ('script', 'style', 'iframe', 'object', 'template', 'svg', 'math', 'noscript', 'textarea', 'title')
+    allowed_attributes = ('class', 'title', 'lang', 'dir')
+    allowed_tag_attributes = {
+        'a': ('href', 'name', 'target', 'rel'),
+        'blockquote': ('cite',),
+        'col': ('span',),
+        'colgroup': ('span',),
+        'del': ('cite', 'datetime'),
+        'img': ('src', 'alt', 'width', 'height'),
+        'ins': ('cite', 'datetime'),
+        'ol': ('start', 'type', 'reversed'),
+        'q': ('cite',),
+        'td': ('colspan', 'rowspan', 'headers'),
+        'th': ('colspan', 'rowspan', 'headers', 'scope'),
+        'time': ('datetime',),
+    }
+    url_attributes = ('href', 'src', 'cite')
+    safe_url_schemes = ('http', 'https', 'mailto')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.output = []
+        self.skip_depth = 0
+
+    def _get_attrs(self, tag, attrs):
+        allowed_attributes = self.allowed_attributes + self.allowed_tag_attributes.get(tag, ())
+
+        for name, value in attrs:
+            if name not in allowed_attributes:
+                continue
+
+            if value is None:
+                yield f' {name}'
+                continue
+
+            if name in self.url_attributes and not _is_safe_url(value):
+                value = '#'
+            yield f' {name}="{escape(value)}"'
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.unsafe_tags:
+            self.skip_depth += 1
+        elif tag in self.allowed_tags and not self.skip_depth:
+            self.output.append(f'<{tag}{"".join(self._get_attrs(tag, attrs))}>')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in self.allowed_tags and not self.skip_depth:
+            self.output.append(f'<{tag}{"".join(self._get_attrs(tag, attrs))} />')
+
+    def handle_endtag(self, tag):
+        if tag in self.unsafe_tags:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag in self.allowed_tags and tag not in self.void_tags and not self.skip_depth:
+            self.output.append(f'</{tag}>')
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.output.append(escape(data, quote=False))
+
+    def handle_entityref(self, name):
+        if not self.skip_depth:
+            self.output.append(f'&{name};')
+
+    def handle_charref(self, name):
+        if not self.skip_depth:
+            self.output.append(f'&#{name};')
+
+
+def get_synthetic_request(language=None, path='/'):
+    """
+    Returns an anonymous request which can be used to render
+    modules outside of the request/response cycle.
+    """
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.session = {}
+    request.current_page = None
+    request.LANGUAGE_CODE = language or settings.LANGUAGE_CODE
+    request.META['HTTP_HOST'] = Site.objects.get_current().domain
+    request.toolbar = EmptyToolbar(request)
+    return request
+
+
+def get_tree_fingerprint(plugins):
+    """
+    Returns a fingerprint for the given (unbound) plugins which
+    changes whenever any of them is added, removed, moved or edited.
+    """
+    values = plugins.order_by('path').values_list('pk', 'path', 'position', 'changed_date')
+    digest = hashlib.sha1()
+
+    for value in values.iterator():
+        digest.update(repr(value).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get_module_fingerprint(module):
+    return get_tree_fingerprint(CMSPlugin.get_tree(module))
+
+
+def sanitize_html(content):
+    """
+    Makes rendered content inert, keeping only allowed tags and
+    attributes, and urls which are http(s), mailto or relative.
+    """
+    sanitizer = _Sanitizer()
+    sanitizer.feed(content)
+    sanitizer.close()
+    return ''.join(sanitizer.output)
+
+
+def render_module(module, request=None, context=None):
+    """
+    Renders the given module and its plugins through the
+    module's render template.
+    """
+    request = request or get_synthetic_request(language=module.language)
+    plugins = CMSPlugin.get_tree(module).order_by('path')
+    # Fetches each plugin type in one query
+    plugins = list(downcast_plugins(plugins, placeholders=[module.placeholder], request=request))
+    root = build_plugin_tree(plugins)[0]
+    renderer = request.toolbar.get_content_renderer()
+    context = context or SekizaiContext({'request': request})
+
+    with translation.override(module.language):
+        return renderer.render_plugin(root, context, placeholder=module.placeholder)
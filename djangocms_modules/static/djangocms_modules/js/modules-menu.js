@@ -0,0 +1,251 @@
+/*
+ * A single, virtualised list of all modules, shared by the "add plugin"
+ * menus of all placeholders. Modules are loaded from the modules catalog
+ * when a menu is opened for the first time and only the rows which are
+ * scrolled into view are rendered.
+ *
+ * Loaded as is by ``ModulesToolbar.Media``, after the bundle.
+ */
+(function ($, Plugin) {
+    'use strict';
+
+    var ROW_HEIGHT = 36;
+    var VISIBLE_ROWS = 8;
+    var OVERSCAN = 4;
+
+    var originalGetPossibleChildClasses = Plugin.prototype._getPossibleChildClasses;
+    var originalFilterPluginsList = Plugin.prototype._filterPluginsList;
+    var menu;
+
+    function escapeHtml(value) {
+        return String(value).replace(/[&<>"']/g, function (character) {
+            return '&#' + character.charCodeAt(0) + ';';
+        });
+    }
+
+    /**
+     * @class ModulesMenu
+     * @param {String} catalogUrl url of the modules catalog
+     */
+    function ModulesMenu(catalogUrl) {
+        var that = this;
+
+        this.catalogUrl = catalogUrl;
+        this.rows = [];
+        this.filteredRows = [];
+        this.plugin = null;
+        this.previews = {};
+        this.loaded = null;
+        this.ui = {
+            container: $('<div class="cms-modules-menu-list"></div>'),
+            spacer: $('<div class="cms-modules-menu-spacer"></div>'),
+            preview: $('<div class="cms-modules-menu-preview"></div>').hide()
+        };
+        this.ui.container.append(this.ui.spacer);
+        this.ui.container.on('scroll', function () {
+            that._render();
+        });
+        this.ui.container.on('click', 'a', function (e) {
+            if (that.plugin) {
+                that.plugin._delegate(e);
+            }
+        });
+        this.ui.container.on('mouseenter', 'a[data-preview-url]', function (e) {
+            that._showPreview($(e.currentTarget));
+        });
+        this.ui.container.on('mouseleave', function () {
+            that.ui.preview.hide();
+        });
+    }
+
+    /**
+     * Loads the catalog on first use.
+     *
+     * @method load
+     * @returns {Promise} resolved once the rows are known
+     */
+    ModulesMenu.prototype.load = function () {
+        var that = this;
+
+        if (!this.loaded) {
+            this.loaded = $.getJSON(this.catalogUrl, { language: CMS.config.request.language }).then(function (data) {
+                that.rows = that._getRows(data.categories);
+                that.filteredRows = that.rows;
+            });
+        }
+        return this.loaded;
+    };
+
+    /**
+     * Flattens the catalog into title and module rows.
+     *
+     * @method _getRows
+     * @private
+     * @param {Object[]} categories catalog categories
+     * @returns {Object[]} rows
+     */
+    ModulesMenu.prototype._getRows = function (categories) {
+        var rows = [];
+
+        categories.forEach(function (category) {
+            if (!category.modules.length) {
+                return;
+            }
+            rows.push({ title: true, name: category.name, category: category.name });
+            category.modules.forEach(function (module) {
+                rows.push($.extend({ category: category.name }, module));
+            });
+        });
+        return rows;
+    };
+
+    /**
+     * Moves the shared list into the given menu element.
+     *
+     * @method attach
+     * @param {jQuery} element modules menu element of the plugin picker
+     * @param {Plugin} plugin plugin instance the picker belongs to
+     * @returns {Promise} resolved once the list is rendered
+     */
+    ModulesMenu.prototype.attach = function (element, plugin) {
+        var that = this;
+
+        this.plugin = plugin;
+        element.append(this.ui.container, this.ui.preview.hide());
+
+        return this.load().then(function () {
+            that.filter('');
+            element.toggle(that.rows.length > 0);
+            element.prev('.cms-submenu-item-title').toggle(that.rows.length > 0);
+        });
+    };
+
+    /**
+     * Filters the modules by name or category name.
+     *
+     * @method filter
+     * @param {String} query search query
+     * @returns {Boolean} whether any module matches
+     */
+    ModulesMenu.prototype.filter = function (query) {
+        var term = query.toLowerCase();
+        var categories = {};
+
+        if (!term) {
+            this.filteredRows = this.rows;
+        } else {
+            this.filteredRows = this.rows.filter(function (row) {
+                return !row.title && (row.category + ' ' + row.name).toLowerCase().indexOf(term) !== -1;
+            });
+            this.filteredRows.forEach(function (row) {
+                categories[row.category] = true;
+            });
+            this.filteredRows = this.rows.filter(function (row) {
+                return row.title ? categories[row.name] : this.filteredRows.indexOf(row) !== -1;
+            }, this);
+        }
+
+        this.ui.container.scrollTop(0);
+        this._render();
+        return this.filteredRows.length > 0;
+    };
+
+    /**
+     * Shows the preview of the hovered module.
+     *
+     * @method _showPreview
+     * @private
+     * @param {jQuery} link module link
+     */
+    ModulesMenu.prototype._showPreview = function (link) {
+        var that = this;
+        var url = link.data('previewUrl');
+
+        // previews are rendered offline, modules without one are skipped
+        if (!this.previews[url]) {
+            this.previews[url] = $.get(url).then(function (html) {
+                return html;
+            }, function () {
+                return '';
+            });
+        }
+
+        this.previews[url].then(function (html) {
+            if (link.is(':hover')) {
+                that.ui.preview.html(html).toggle(html !== '');
+            }
+        });
+    };
+
+    /**
+     * Renders the rows which are currently visible.
+     *
+     * @method _render
+     * @private
+     */
+    ModulesMenu.prototype._render = function () {
+        var rows = this.filteredRows;
+        var scrollTop = this.ui.container.scrollTop();
+        var start = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+        var end = Math.min(rows.length, start + VISIBLE_ROWS + OVERSCAN * 2);
+        var html = rows.slice(start, end).map(function (row, index) {
+            var style = 'top: ' + (start + index) * ROW_HEIGHT + 'px';
+
+            if (row.title) {
+                return '<div class="cms-modules-menu-row cms-modules-menu-title" style="' + style + '">' +
+                    '<span>' + escapeHtml(row.name) + '</span></div>';
+            }
+            return '<div class="cms-modules-menu-row" style="' + style + '">' +
+                '<a data-rel="add" href="' + escapeHtml(row.plugin_type) + '"' +
+                ' data-url="' + escapeHtml(row.add_url) + '"' +
+                ' data-preview-url="' + escapeHtml(row.preview_url) + '">' + escapeHtml(row.name) + '</a></div>';
+        });
+
+        this.ui.container.css('height', Math.min(rows.length, VISIBLE_ROWS) * ROW_HEIGHT);
+        this.ui.spacer.css('height', rows.length * ROW_HEIGHT).html(html.join(''));
+    };
+
+    function getModulesMenu(catalogUrl) {
+        if (!menu) {
+            menu = new ModulesMenu(catalogUrl);
+        }
+        return menu;
+    }
+
+    Plugin.prototype._getPossibleChildClasses = function () {
+        var resultElements = originalGetPossibleChildClasses.apply(this, arguments);
+        var menuElement = resultElements.filter('.js-cms-modules-menu');
+        var childRestrictions = this.options.plugin_restriction;
+
+        if (!menuElement.length && childRestrictions && childRestrictions.indexOf('Module') !== -1) {
+            // The menu has no plugin link of its own, so child restrictions
+            // drop it (and its title) even if modules are allowed.
+            var placeholderId = this._getId(this.ui.submenu.closest('.cms-dragarea'));
+            var allElements = $($('#cms-plugin-child-classes-' + placeholderId).html());
+            var titleElement = allElements.filter('.cms-submenu-item-title').has('.cms-submenu-item-title-module');
+
+            menuElement = allElements.filter('.js-cms-modules-menu');
+            resultElements = $(titleElement.get().concat(menuElement.get(), resultElements.get()));
+        }
+
+        if (menuElement.length) {
+            getModulesMenu(menuElement.data('catalogUrl')).attach(menuElement, this);
+        }
+        return resultElements;
+    };
+
+    Plugin.prototype._filterPluginsList = function (list, input) {
+        var result = originalFilterPluginsList.call(this, list, input);
+        var menuElement = list.find('.js-cms-modules-menu');
+
+        if (menuElement.length) {
+            getModulesMenu(menuElement.data('catalogUrl')).load().then(function () {
+                var hasMatches = getModulesMenu().filter(input.val());
+
+                menuElement.toggle(hasMatches);
+                menuElement.prev('.cms-submenu-item-title').toggle(hasMatches);
+            });
+        }
+        return result;
+    };
+})(CMS.$, CMS.Plugin);
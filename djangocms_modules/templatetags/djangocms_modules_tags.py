@@ -1,9 +1,7 @@
 from django import template
 from django.conf import settings
 
-from cms.utils.urlutils import admin_reverse
-
-from ..models import Category
+from .. import utils
 
 
 register = template.Library()
@@ -17,14 +15,19 @@ def get_default_language():
 
 @register.simple_tag(takes_context=False)
 def get_module_categories():
-    return Category.objects.order_by('name')
+    return utils.get_module_categories()
 
 
 @register.simple_tag()
 def get_module_add_url(module_):
-    return admin_reverse('cms_add_module', args=[module_.pk])
+    return utils.get_add_module_url(module_.pk)
+
+
+@register.simple_tag(takes_context=False)
+def get_modules_catalog_url():
+    return utils.get_modules_catalog_url()
 
 
 @register.simple_tag(takes_context=False)
 def get_module_url(module_):
-    return admin_reverse('cms_modules_list') + f'#cms-plugin-{module_.pk}'
+    return utils.get_modules_list_url() + f'#cms-plugin-{module_.pk}'
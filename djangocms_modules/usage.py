@@ -0,0 +1,117 @@
+"""
+Counts how often modules are applied and previewed.
+
+Counts are added up in the cache (``DJANGOCMS_MODULES_USAGE_CACHE``), so that
+using a module does not write to the database, and written to the
+``ModuleUsage`` table by the ``flush_module_usage`` management command. The
+cache has to be shared by all processes, e.g. Redis or Memcached, counts are
+kept there until they are written.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+from .models import ModulePlugin, ModuleUsage
+
+
+APPLIED = 'applied'
+PREVIEWED = 'previewed'
+COUNTERS = (APPLIED, PREVIEWED)
+
+
+def get_usage_cache():
+    return caches[getattr(settings, 'DJANGOCMS_MODULES_USAGE_CACHE', 'default')]
+
+
+def get_cache_key(module_id, counter):
+    return f'djangocms_modules_usage:{module_id}:{counter}'
+
+
+def count_module_usage(module_id, counter, count=1):
+    """
+    Adds to the given counter (APPLIED or PREVIEWED) of the module.
+    """
+    cache = get_usage_cache()
+    key = get_cache_key(module_id, counter)
+
+    if cache.add(key, count, timeout=None):
+        return
+
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        # Evicted in the meantime
+        cache.add(key, count, timeout=None)
+
+
+def flush_module_usage(batch_size=500):
+    """
+    Writes the counts in the cache to the database.
+    Returns the number of modules which have been updated.
+    """
+    cache = get_usage_cache()
+    module_ids = ModulePlugin.get_library_modules().order_by('pk').values_list('pk', flat=True)
+    batch = []
+    updated = 0
+
+    for module_id in module_ids.iterator():
+        batch.append(module_id)
+
+        if len(batch) == batch_size:
+            updated += write_module_usage(cache, batch)
+            batch = []
+
+    if batch:
+        updated += write_module_usage(cache, batch)
+    return updated
+
+
+def write_module_usage(cache, module_ids):
+    keys = {
+        get_cache_key(module_id, counter): (module_id, counter)
+        for module_id in module_ids
+        for counter in COUNTERS
+    }
+    counts = {keys[key]: count for key, count in cache.get_many(keys).items() if count}
+
+    if not counts:
+        return 0
+
+    # Counts added while writing are kept for the next flush
+    for (module_id, counter), count in counts.items():
+        try:
+            cache.decr(get_cache_key(module_id, counter), count)
+        except ValueError:
+            # Evicted since it has been read, the count is still written
+            pass
+
+    counts_by_module = {}
+
+    for (module_id, counter), count in counts.items():
+        counts_by_module.setdefault(module_id, dict.fromkeys(COUNTERS, 0))[counter] += count
+
+    # The counters are incremented by the database, as the
+    # command might run in several processes at the same time.
+    usages = [
+        ModuleUsage(
+            module_id=module_id,
+            applied=F(APPLIED) + module_counts[APPLIED],
+            previewed=F(PREVIEWED) + module_counts[PREVIEWED],
+        )
+        for module_id, module_counts in counts_by_module.items()
+    ]
+
+    try:
+        with transaction.atomic():
+            ModuleUsage.objects.bulk_create(
+                [ModuleUsage(module_id=module_id) for module_id in counts_by_module],
+                ignore_conflicts=True,
+            )
+            ModuleUsage.objects.bulk_update(usages, [APPLIED, PREVIEWED])
+    except Exception:
+        # Puts the counts back, to write them with the next flush
+        for (module_id, counter), count in counts.items():
+            count_module_usage(module_id, counter, count)
+        raise
+    return len(usages)
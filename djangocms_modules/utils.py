@@ -0,0 +1,104 @@
+from functools import wraps
+
+from django.db.models import prefetch_related_objects
+
+from cms.utils.plugins import assign_plugins
+from cms.utils.urlutils import admin_reverse
+
+from asgiref.local import Local
+
+from .models import Category, ModulePlugin, ModulesPlaceholder
+
+
+_request_local = Local()
+
+
+def enable_request_cache(**kwargs):
+    """
+    Starts a new cache for the current request.
+    Connected to the ``request_started`` signal.
+    """
+    _request_local.cache = {}
+
+
+def disable_request_cache(**kwargs):
+    """
+    Drops the cache of the current request.
+    Connected to the ``request_finished`` signal.
+    """
+    _request_local.cache = None
+
+
+def request_cached(func):
+    """
+    Memoises the result of ``func`` for the duration of the current request.
+    Outside of a request the function is called every time.
+    """
+    @wraps(func)
+    def wrapper(*args):
+        cache = getattr(_request_local, 'cache', None)
+
+        if cache is None:
+            return func(*args)
+
+        key = (func.__qualname__, *args)
+
+        if key not in cache:
+            cache[key] = func(*args)
+        return cache[key]
+    return wrapper
+
+
+@request_cached
+def get_module_categories():
+    return list(Category.objects.order_by('name'))
+
+
+@request_cached
+def _get_module_url_parts(url_name):
+    # Reverse once and build the url of every module from it
+    url = admin_reverse(url_name, args=[0])
+    prefix, _, suffix = url.rpartition('/0/')
+    return prefix, suffix
+
+
+def get_add_module_url(module_id):
+    prefix, suffix = _get_module_url_parts('cms_add_module')
+    return f'{prefix}/{module_id}/{suffix}'
+
+
+def get_module_preview_url(module_id):
+    prefix, suffix = _get_module_url_parts('cms_module_preview')
+    return f'{prefix}/{module_id}/{suffix}'
+
+
+@request_cached
+def get_modules_list_url():
+    return admin_reverse('cms_modules_list')
+
+
+@request_cached
+def get_modules_catalog_url():
+    return admin_reverse('cms_modules_catalog')
+
+
+def prefetch_module_plugins(request, categories, language):
+    """
+    Loads the placeholders of the given categories and their plugins,
+    so that rendering them does not query the plugins of each category.
+    Plugins are loaded with one query per plugin type for all categories,
+    followed by the usage counters of the modules.
+    """
+    placeholders = ModulesPlaceholder.objects.in_bulk([category.modules_id for category in categories])
+
+    for category in categories:
+        # Replaces the cached_property of the category
+        category.__dict__['modules_placeholder'] = placeholders[category.modules_id]
+    assign_plugins(request, placeholders.values(), lang=language)
+    modules = [
+        plugin
+        for placeholder in placeholders.values()
+        for plugin in placeholder._plugins_cache
+        if isinstance(plugin, ModulePlugin)
+    ]
+    prefetch_related_objects(modules, 'usage')
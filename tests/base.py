@@ -0,0 +1,40 @@
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+from cms.api import add_plugin
+from cms.models import Placeholder
+from cms.test_utils.testcases import CMSTestCase
+
+from djangocms_modules.cms_plugins import Module
+from djangocms_modules.models import Category, ModulePlugin
+
+
+class ModulesTestCase(CMSTestCase):
+
+    def setUp(self):
+        self.superuser = self.get_superuser()
+        self.category = Category.objects.create(name='Teasers')
+
+    def create_module(self, name, category=None, body='Lorem ipsum', language='en'):
+        category = category or self.category
+        source = self.get_placeholder()
+        add_plugin(source, 'TextPlugin', language, body=body)
+        Module.create_module_plugin(
+            name=name,
+            category=category,
+            plugins=list(source.get_plugins(language)),
+            language=language,
+        )
+        return ModulePlugin.objects.filter(module_category=category, module_name=name).latest('pk')
+
+    def use_temporary_previews_root(self):
+        previews_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, previews_root)
+        settings_override = override_settings(DJANGOCMS_MODULES_PREVIEWS_ROOT=previews_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get_placeholder(self):
+        return Placeholder.objects.create(slot='content')
@@ -1,6 +1,12 @@
 #!/usr/bin/env python
 HELPER_SETTINGS = {
-    'INSTALLED_APPS': [],
+    # Needs to be loaded before cms to override its templates
+    'TOP_INSTALLED_APPS': [
+        'djangocms_modules',
+    ],
+    'INSTALLED_APPS': [
+        'tests.test_app',
+    ],
     'CMS_LANGUAGES': {
         1: [{
             'code': 'en',
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""
+Measures the cost of setting up django CMS with djangocms_modules installed
+and lists the modules of the app which have been imported by then.
+
+Run it from the repository root::
+
+    python tests/startup.py
+"""
+import json
+import os
+import sys
+import time
+
+
+def run():
+    from app_helper import runner
+
+    from tests import settings as helper_settings
+
+    start = time.perf_counter()
+    runner.setup('djangocms_modules', helper_settings, use_cms=True)
+
+    from cms.plugin_pool import plugin_pool
+
+    # Plugins are discovered on the first request
+    plugin_pool.discover_plugins()
+    duration = time.perf_counter() - start
+    modules = sorted(name for name in sys.modules if name.startswith('djangocms_modules'))
+    return {'seconds': duration, 'modules': modules}
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(json.dumps(run(), indent=2))
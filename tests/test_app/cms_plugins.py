@@ -0,0 +1,11 @@
+from cms.plugin_base import CMSPluginBase
+from cms.plugin_pool import plugin_pool
+
+from .models import TextPluginModel
+
+
+@plugin_pool.register_plugin
+class TextPlugin(CMSPluginBase):
+    name = 'Text'
+    model = TextPluginModel
+    render_template = 'test_app/text.html'
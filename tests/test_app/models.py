@@ -0,0 +1,10 @@
+from django.db import models
+
+from cms.models import CMSPlugin
+
+
+class TextPluginModel(CMSPlugin):
+    body = models.TextField()
+
+    def __str__(self):
+        return self.body
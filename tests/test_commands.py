@@ -0,0 +1,354 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils.timezone import now
+
+from cms.api import add_plugin
+from cms.models import CMSPlugin
+
+from djangocms_modules.management.commands.check_modules import Command as CheckModulesCommand
+from djangocms_modules.models import Category, ModulePlugin
+from djangocms_modules.previews import get_module_preview
+from djangocms_modules.rendering import sanitize_html
+
+from .base import ModulesTestCase
+
+
+class RenderModulePreviewsTestCase(ModulesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_previews_root()
+
+    def test_renders_changed_modules_only(self):
+        module = self.create_module(
+            name='Hero',
+            body='<b onclick="alert(1)">Hello</b><script>alert(2)</script><a href="javascript:alert(3)">a &amp; b</a>',
+        )
+        output = StringIO()
+
+        call_command('render_module_previews', stdout=output)
+        call_command('render_module_previews', stdout=output)
+
+        self.assertIn('rendered "1" module previews, "0" were up to date', output.getvalue())
+        self.assertIn('rendered "0" module previews, "1" were up to date', output.getvalue())
+        self.assertEqual(get_module_preview(module).strip(), '<p><b>Hello</b><a href="#">a &amp; b</a></p>')
+
+        self.create_module('Teaser')
+        call_command('render_module_previews', stdout=output)
+        self.assertIn('rendered "1" module previews, "1" were up to date', output.getvalue())
+
+    def test_sanitizes_urls_and_tags(self):
+        unsafe_urls = [
+            'javascript:alert(1)',
+            ' JavaScript:alert(1)',
+            'java&#x09;script:alert(1)',
+            'java&#x0A;script:alert(1)',
+            '&#x01;javascript:alert(1)',
+            'data:text/html;base64,PHNjcmlwdD4=',
+            'vbscript:msgbox(1)',
+        ]
+
+        for url in unsafe_urls:
+            with self.subTest(url=url):
+                self.assertEqual(sanitize_html(f'<a href="{url}">a</a>'), '<a href="#">a</a>')
+
+        safe_urls = ['https://example.com/', 'mailto:info@example.com', '/a:b', '?page=2', '#top']
+
+        for url in safe_urls:
+            with self.subTest(url=url):
+                self.assertEqual(sanitize_html(f'<a href="{url}">a</a>'), f'<a href="{url}">a</a>')
+
+        self.assertEqual(
+            sanitize_html(
+                '<base href="https://example.com/"><link rel="stylesheet" href="/a.css"><meta http-equiv="refresh">'
+                '<form action="/login"><input name="q" /></form><p>Hello</p>'
+            ),
+            '<p>Hello</p>',
+        )
+
+    def test_sanitizes_split_tags(self):
+        self.assertEqual(
+            sanitize_html('<<script></script>script>alert(1)<</script>/script>'),
+            '&lt;script&gt;alert(1)&lt;/script&gt;',
+        )
+        self.assertEqual(
+            sanitize_html('<<script>x</script>img src=x onerror=alert(1)>'),
+            '&lt;img src=x onerror=alert(1)&gt;',
+        )
+
+    def test_keeps_allowed_tags_and_attributes_only(self):
+        self.assertEqual(
+            sanitize_html('<svg><animate attributeName="href" values="javascript:alert(1)" /><a>x</a></svg>Hello'),
+            'Hello',
+        )
+        self.assertEqual(
+            sanitize_html(
+                '<p class="lead" style="color: red" data-toggle="modal">a &amp; b &#60; '
+                '<img src="/a.png" alt="A" srcset="javascript:alert(1)"><br /><custom-tag>c</custom-tag></p>'
+            ),
+            '<p class="lead">a &amp; b &#60; <img src="/a.png" alt="A"><br />c</p>',
+        )
+
+
+@override_settings(LANGUAGES=(('en', 'English'), ('de', 'German')))
+class SyncModuleLanguagesTestCase(ModulesTestCase):
+
+    def sync(self, *args):
+        output = StringIO()
+        call_command('sync_module_languages', *args, stdout=output)
+        return output.getvalue()
+
+    def test_copies_new_and_changed_modules_only(self):
+        module = self.create_module('Hero', body='Hello')
+        self.create_module('Teaser', body='World')
+
+        self.assertIn('"2" created, "0" updated, "0" unchanged, "0" deleted', self.sync())
+        self.assertEqual(
+            sorted(module.module_name for module in self.category.get_non_empty_modules(language='de')),
+            ['Hero', 'Teaser'],
+        )
+        self.assertIn('"0" created, "0" updated, "2" unchanged, "0" deleted', self.sync())
+
+        text = module.get_children()[0].get_bound_plugin()
+        text.body = 'Hello again'
+        text.save()
+
+        self.assertIn('"0" created, "1" updated, "1" unchanged, "0" deleted', self.sync())
+        variant = module.get_variants().get()
+        self.assertEqual(variant.language, 'de')
+        self.assertEqual(variant.position, module.position)
+        self.assertEqual(
+            [plugin.get_bound_plugin().body for plugin in variant.get_children()],
+            ['Hello again'],
+        )
+        self.assertEqual(self.category.modules.get_plugins('de').count(), 4)
+
+    def test_pairs_variants_with_their_source_module(self):
+        module = self.create_module('Hero', body='Hello')
+        other_module = self.create_module('Hero', body='World')
+        teaser = self.create_module('Teaser')
+        # Created in German, not a variant
+        german_module = self.create_module('Held', language='de')
+
+        self.assertIn('"3" created', self.sync())
+        self.assertEqual(
+            [plugin.get_bound_plugin().body for plugin in other_module.get_variants().get().get_children()],
+            ['World'],
+        )
+
+        ModulePlugin.objects.filter(pk=module.pk).update(module_name='Banner')
+        CMSPlugin.objects.filter(pk=teaser.pk).delete()
+
+        self.assertIn('"0" created, "1" updated, "1" unchanged, "1" deleted', self.sync('--dry-run'))
+        self.assertEqual(len(list(self.category.get_non_empty_modules(language='de'))), 4)
+
+        self.assertIn('"0" created, "1" updated, "1" unchanged, "1" deleted', self.sync())
+        self.assertEqual(module.get_variants().get().module_name, 'Banner')
+        self.assertEqual(
+            sorted(module.module_name for module in self.category.get_non_empty_modules(language='de')),
+            ['Banner', 'Held', 'Hero'],
+        )
+        self.assertTrue(ModulePlugin.objects.filter(pk=german_module.pk).exists())
+
+    def test_keeps_plugins_edited_in_the_variant(self):
+        module = self.create_module('Hero', body='Hello')
+        self.sync()
+        variant = module.get_variants().get()
+        translation = variant.get_children()[0].get_bound_plugin()
+        translation.body = 'Hallo'
+        translation.save()
+
+        text = module.get_children()[0].get_bound_plugin()
+        text.body = 'Hello again'
+        text.save()
+        add_plugin(self.category.modules, 'TextPlugin', 'en', target=module, body='World')
+
+        self.assertIn('"0" created, "1" updated, "0" unchanged, "0" deleted, "1" edited plugins kept', self.sync())
+        self.assertEqual(
+            [(plugin.pk, plugin.get_bound_plugin().body) for plugin in variant.get_children()],
+            [(translation.pk, 'Hallo'), (variant.get_children()[1].pk, 'World')],
+        )
+        self.assertIn('"0" created, "0" updated, "1" unchanged, "0" deleted, "1" edited plugins kept', self.sync())
+
+        CMSPlugin.objects.filter(pk=text.pk).delete()
+        CMSPlugin.objects.filter(pk=module.get_children()[0].pk).delete()
+
+        self.assertIn('"1" updated, "0" unchanged, "0" deleted, "1" edited plugins kept', self.sync())
+        self.assertEqual([plugin.pk for plugin in variant.get_children()], [translation.pk])
+
+    def test_pairs_the_plugins_of_variants_synced_before(self):
+        module = self.create_module('Hero', body='Hello')
+        self.create_module('Teaser', body='World')
+        self.sync()
+        ModulePlugin.objects.update(synced_plugins={})
+        variant = module.get_variants().get()
+        translation = variant.get_children()[0]
+        CMSPlugin.objects.filter(pk=translation.pk).update(changed_date=now() + timedelta(minutes=5))
+        CMSPlugin.objects.filter(pk=module.get_children()[0].pk).update(changed_date=now() + timedelta(minutes=10))
+
+        self.assertIn('"0" created, "0" updated, "2" unchanged, "0" deleted, "1" edited plugins kept', self.sync())
+        self.assertEqual(variant.get_children().get().pk, translation.pk)
+        self.assertEqual(len(ModulePlugin.objects.get(pk=variant.pk).synced_plugins), 2)
+
+
+class UpdateModulesLanguageTestCase(ModulesTestCase):
+
+    def test_leaves_variants_alone(self):
+        self.create_module('Hero')
+        call_command('sync_module_languages', languages=['de'], stdout=StringIO())
+        # Created in German, not a variant
+        german_module = self.create_module('Held', language='de')
+        output = StringIO()
+        call_command('update_modules_language', stdout=output)
+
+        self.assertIn('"1" module categories, skipped "1" module variants', output.getvalue())
+        self.assertEqual(CMSPlugin.get_tree(german_module).filter(language='en').count(), 2)
+        self.assertEqual(self.category.modules.get_plugins('de').count(), 2)
+
+
+class CheckModulesTestCase(ModulesTestCase):
+
+    def check_modules(self, *args):
+        output = StringIO()
+        call_command('check_modules', *args, chunk_size=1, stdout=output)
+        return output.getvalue()
+
+    def test_reports_and_fixes_problems(self):
+        other_category = Category.objects.create(name='Other')
+        module = self.create_module('Hero')
+        empty_module = self.create_module('Empty')
+        child = empty_module.get_children()[0]
+        CMSPlugin.objects.filter(pk=child.pk).delete()
+        # Leaves the tree broken, as if a request failed partway
+        CMSPlugin.objects.filter(pk=module.pk).update(numchild=3)
+        CMSPlugin.objects.filter(pk=module.get_children()[0].pk).update(language='de', depth=3)
+        ModulePlugin.objects.filter(pk=module.pk).update(module_category=other_category)
+
+        output = self.check_modules()
+
+        self.assertIn('"2" module categories and "3" plugins', output)
+        self.assertIn('Plugins with a wrong module category: 1 found.', output)
+        self.assertIn('Empty modules: 1 found.', output)
+        self.assertIn('Plugins with a different language than their module: 1 found.', output)
+        self.assertIn('Plugins with a wrong number of children: 1 found.', output)
+        self.assertIn('Plugins with a wrong depth: 1 found.', output)
+        self.assertEqual(ModulePlugin.objects.get(pk=module.pk).module_category, other_category)
+
+        output = self.check_modules('--fix')
+
+        self.assertIn('Plugins with a wrong module category: 1 found, 1 fixed.', output)
+        # Modules are only deleted on request
+        self.assertIn('Empty modules: 1 found, 0 fixed.', output)
+        self.assertTrue(CMSPlugin.objects.filter(pk=empty_module.pk).exists())
+
+        self.assertIn('Empty modules: 1 found, 1 fixed.', self.check_modules('--fix', '--delete-empty'))
+        self.assertFalse(CMSPlugin.objects.filter(pk=empty_module.pk).exists())
+
+        module = ModulePlugin.objects.get(pk=module.pk)
+        self.assertEqual(module.module_category, self.category)
+        self.assertEqual(module.numchild, 1)
+        self.assertEqual(
+            list(CMSPlugin.get_tree(module).values_list('language', 'depth')),
+            [('en', 1), ('en', 2)],
+        )
+        self.assertNotIn('1 found', self.check_modules())
+
+    def test_fixes_the_plugins_as_they_are_when_fixing(self):
+        module = self.create_module('Hero')
+        CMSPlugin.objects.filter(pk=module.pk).update(numchild=3)
+        scan_chunk = CheckModulesCommand.scan_chunk
+
+        def scan_and_add_plugin(command, categories_by_placeholder, lock=False):
+            result = scan_chunk(command, categories_by_placeholder, lock=lock)
+
+            if not lock:
+                # Added by an editor after the plugins have been scanned
+                add_plugin(self.category.modules, 'TextPlugin', 'en', target=module, body='World')
+            return result
+
+        with mock.patch.object(CheckModulesCommand, 'scan_chunk', autospec=True, side_effect=scan_and_add_plugin):
+            self.assertIn('Plugins with a wrong number of children: 1 found, 1 fixed.', self.check_modules('--fix'))
+
+        self.assertEqual(CMSPlugin.objects.get(pk=module.pk).numchild, 2)
+
+
+class ReportModuleDuplicatesTestCase(ModulesTestCase):
+
+    def test_lists_duplicate_clusters(self):
+        other_category = Category.objects.create(name='Other')
+        module = self.create_module('Hero', body='Hello')
+        duplicate = self.create_module('Hero copy', category=other_category, body='Hello')
+        self.create_module('Teaser', body='World')
+        edited = self.create_module('Teaser copy', body='Hello world')
+        text = edited.get_children()[0].get_bound_plugin()
+        text.body = 'World'
+        text.save()
+
+        self.assertEqual(module.content_hash, duplicate.content_hash)
+        self.assertNotEqual(module.content_hash, '')
+
+        output = StringIO()
+        call_command('report_module_duplicates', stdout=output)
+
+        self.assertIn(f'Other / Hero copy (#{duplicate.pk})', output.getvalue())
+        self.assertIn(f'Teasers / Teaser copy (#{edited.pk})', output.getvalue())
+        self.assertIn('Found "2" duplicated modules.', output.getvalue())
+
+    def test_computes_missing_content_hashes(self):
+        module = self.create_module('Hero')
+        content_hash = module.content_hash
+        # Modules created before content hashes were stored
+        module.update(content_hash='')
+
+        call_command('report_module_duplicates', '--skip-update', stdout=StringIO())
+        self.assertEqual(ModulePlugin.objects.get(pk=module.pk).content_hash, '')
+
+        call_command('report_module_duplicates', stdout=StringIO())
+        self.assertEqual(ModulePlugin.objects.get(pk=module.pk).content_hash, content_hash)
+
+
+class BuildModulesStyleguideTestCase(ModulesTestCase):
+
+    def build(self, output_dir):
+        output = StringIO()
+        call_command('build_modules_styleguide', output_dir, stdout=output)
+        return output.getvalue()
+
+    def test_renders_changed_categories_only(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        module = self.create_module('Hero', body='Hello')
+        other_category = Category.objects.create(name='Other')
+        self.create_module('Teaser', category=other_category, body='World')
+
+        self.assertIn('rendered "2" module categories, "0" were up to date', self.build(output_dir))
+        self.assertEqual(
+            sorted(os.listdir(output_dir)),
+            ['index.html', 'manifest.json', f'other-{other_category.pk}.html', f'teasers-{self.category.pk}.html'],
+        )
+
+        with open(os.path.join(output_dir, f'teasers-{self.category.pk}.html')) as category_file:
+            self.assertIn('<p>Hello</p>', category_file.read())
+
+        with open(os.path.join(output_dir, 'index.html')) as index_file:
+            self.assertIn(f'<a href="teasers-{self.category.pk}.html">Teasers</a>', index_file.read())
+
+        text = module.get_children()[0].get_bound_plugin()
+        text.body = 'Hello again'
+        text.save()
+
+        self.assertIn('rendered "1" module categories, "1" were up to date', self.build(output_dir))
+
+        with open(os.path.join(output_dir, f'teasers-{self.category.pk}.html')) as category_file:
+            self.assertIn('<p>Hello again</p>', category_file.read())
+
+        other_category.delete()
+        self.assertIn('rendered "0" module categories, "1" were up to date', self.build(output_dir))
+        self.assertNotIn(f'other-{other_category.pk}.html', os.listdir(output_dir))
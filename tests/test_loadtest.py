@@ -0,0 +1,48 @@
+from unittest import mock
+
+from django.db import IntegrityError
+
+from djangocms_modules.cms_plugins import Module
+
+from .base import ModulesTestCase
+from .loadtest import WORKLOAD_VIEWS, format_rows, get_client, percentile, run_worker, seed, summarize
+
+
+class LoadTestTestCase(ModulesTestCase):
+
+    def test_workloads_succeed(self):
+        data = seed(editors=1, categories=2, modules=2)
+        client = get_client(data.users[0])
+
+        for workload in WORKLOAD_VIEWS:
+            results = run_worker(client, data, {workload: 1}, requests=2, seed=0)
+            self.assertEqual([(outcome, error) for name, seconds, outcome, error in results], [('ok', '')] * 2)
+
+    def test_records_the_exception_of_failed_requests(self):
+        data = seed(editors=1, categories=1, modules=1)
+        client = get_client(data.users[0])
+
+        with mock.patch.object(Module, 'create_module_plugin', side_effect=IntegrityError):
+            [(workload, seconds, outcome, error)] = run_worker(client, data, {'cms_create_module': 1}, requests=1)
+
+        self.assertEqual((outcome, error), ('error', 'IntegrityError'))
+
+    def test_summarize(self):
+        results = [('cms_add_module', index / 1000, 'ok', '') for index in range(1, 101)]
+        results += [('cms_add_module', 5, 'error', 'IntegrityError'), ('cms_add_module', 5, 'error', 'HTTP 403')]
+        results += [('cms_modules_list', 0.5, 'locked', 'OperationalError'), ('cms_modules_list', 0.1, 'conflict', '')]
+
+        add_module, modules_list, total = summarize(results, duration=2)
+
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertEqual(add_module['workload'], 'cms_add_module')
+        self.assertEqual(add_module['requests'], 102)
+        # Failed requests are not part of the latencies
+        self.assertAlmostEqual(add_module['p50'], 50)
+        self.assertAlmostEqual(add_module['p99'], 99)
+        self.assertEqual(add_module['throughput'], 50)
+        self.assertEqual(add_module['error_types'], {'IntegrityError': 1, 'HTTP 403': 1})
+        self.assertEqual((modules_list['locked'], modules_list['conflicts']), (1, 1))
+        self.assertIsNone(modules_list['p50'])
+        self.assertEqual(total['requests'], 104)
+        self.assertIn('cms_add_module       IntegrityError', format_rows([add_module, modules_list, total]))
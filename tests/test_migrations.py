@@ -28,3 +28,4 @@ class MigrationTestCase(TestCase):
 
         if status_code == '1':
             self.fail(f'There are missing migrations:\n {output.getvalue()}')
+
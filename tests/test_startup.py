@@ -0,0 +1,23 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+
+class StartupTestCase(SimpleTestCase):
+
+    def test_forms_are_loaded_on_first_use(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, os.path.join('tests', 'startup.py')],
+            cwd=root,
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+        modules = json.loads(output)['modules']
+
+        self.assertIn('djangocms_modules.cms_plugins', modules)
+        self.assertNotIn('djangocms_modules.forms', modules)
+        self.assertNotIn('djangocms_modules.rendering', modules)
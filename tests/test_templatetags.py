@@ -0,0 +1,59 @@
+from django.template import Context, Template
+from django.template.loader import get_template
+
+from cms.utils.urlutils import admin_reverse
+
+from djangocms_modules.utils import disable_request_cache, enable_request_cache
+
+from .base import ModulesTestCase
+
+
+class ModulesTagsTestCase(ModulesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.module = self.create_module('Hero')
+        self.addCleanup(disable_request_cache)
+
+    def test_drag_menu_queries_catalog_once_per_request(self):
+        template = get_template('cms/toolbar/dragitem_menu.html')
+        enable_request_cache()
+
+        with self.assertNumQueries(1):
+            for _ in range(5):
+                content = template.render({'plugin_menu': []})
+
+        self.assertIn(admin_reverse('cms_modules_catalog'), content)
+        # Modules are listed by the shared list, not by each menu
+        self.assertNotIn('Hero', content)
+        self.assertNotIn('href="Module"', content)
+        self.assertEqual(content.count('Modules'), 1)
+
+        # A new request evaluates the categories again
+        enable_request_cache()
+
+        with self.assertNumQueries(1):
+            template.render({'plugin_menu': []})
+
+    def test_drag_menu_without_request_cache(self):
+        template = get_template('cms/toolbar/dragitem_menu.html')
+
+        with self.assertNumQueries(2):
+            template.render({'plugin_menu': []})
+            template.render({'plugin_menu': []})
+
+    def test_module_urls(self):
+        enable_request_cache()
+
+        self.assertEqual(
+            self._render('{% get_module_add_url module %}'),
+            admin_reverse('cms_add_module', args=[self.module.pk]),
+        )
+        self.assertEqual(
+            self._render('{% get_module_url module %}'),
+            admin_reverse('cms_modules_list') + f'#cms-plugin-{self.module.pk}',
+        )
+
+    def _render(self, content):
+        template = Template('{% load djangocms_modules_tags %}' + content)
+        return template.render(Context({'module': self.module}))
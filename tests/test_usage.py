@@ -0,0 +1,68 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+
+from cms.models import CMSPlugin
+
+from djangocms_modules.models import ModuleUsage
+from djangocms_modules.usage import APPLIED, PREVIEWED, count_module_usage, flush_module_usage
+
+from .base import ModulesTestCase
+
+
+class ModuleUsageTestCase(ModulesTestCase):
+
+    def test_counts_are_buffered_until_flushed(self):
+        hero = self.create_module('Hero')
+        teaser = self.create_module('Teaser')
+        count_module_usage(hero.pk, APPLIED)
+        count_module_usage(hero.pk, APPLIED)
+        count_module_usage(teaser.pk, PREVIEWED)
+
+        self.assertFalse(ModuleUsage.objects.exists())
+
+        # Modules, savepoint, insert, update and release
+        with self.assertNumQueries(5):
+            self.assertEqual(flush_module_usage(), 2)
+
+        self.assertEqual(flush_module_usage(), 0)
+        count_module_usage(hero.pk, APPLIED)
+        flush_module_usage(batch_size=1)
+
+        hero_usage = ModuleUsage.objects.get(module=hero)
+        self.assertEqual((hero_usage.applied, hero_usage.previewed), (3, 0))
+        teaser_usage = ModuleUsage.objects.get(module=teaser)
+        self.assertEqual((teaser_usage.applied, teaser_usage.previewed), (0, 1))
+
+    def test_deleted_modules_are_ignored(self):
+        hero = self.create_module('Hero')
+        teaser = self.create_module('Teaser')
+        count_module_usage(hero.pk, APPLIED)
+        count_module_usage(teaser.pk, APPLIED)
+        CMSPlugin.objects.filter(pk=teaser.pk).delete()
+
+        self.assertEqual(flush_module_usage(), 1)
+        self.assertEqual(hero.get_usage().applied, 1)
+
+    def test_counts_are_kept_when_writing_fails(self):
+        hero = self.create_module('Hero')
+        count_module_usage(hero.pk, APPLIED)
+
+        with mock.patch.object(ModuleUsage.objects, 'bulk_update', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                flush_module_usage()
+
+        self.assertEqual(flush_module_usage(), 1)
+        self.assertEqual(hero.get_usage().applied, 1)
+
+    def test_command_writes_the_counts(self):
+        hero = self.create_module('Hero')
+        count_module_usage(hero.pk, PREVIEWED)
+        output = StringIO()
+
+        call_command('flush_module_usage', stdout=output)
+
+        self.assertIn('the usage of "1" modules', output.getvalue())
+        self.assertEqual(hero.get_usage().previewed, 1)
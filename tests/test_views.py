@@ -0,0 +1,326 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from cms.api import add_plugin
+from cms.signals import post_placeholder_operation, pre_placeholder_operation
+from cms.utils.plugins import copy_plugins_to_placeholder
+from cms.utils.urlutils import admin_reverse
+
+from djangocms_modules.cms_plugins import ConcurrentModification, Module
+from djangocms_modules.models import Category, ModulePlugin, ModuleUsage, get_content_hash
+from djangocms_modules.previews import save_module_preview
+from djangocms_modules.usage import flush_module_usage
+
+from .base import ModulesTestCase
+
+
+class ModulesCatalogViewTestCase(ModulesTestCase):
+
+    def test_catalog_lists_non_empty_modules_by_category(self):
+        module = self.create_module('Hero')
+        Category.objects.create(name='Empty')
+        Module.create_module_plugin(name='Empty module', category=self.category, plugins=[])
+        # Applied modules are not part of the catalog
+        copy_plugins_to_placeholder(
+            list(module.get_unbound_plugins()),
+            placeholder=self.get_placeholder(),
+            language='en',
+        )
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(admin_reverse('cms_modules_catalog'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'categories': [
+                {'id': Category.objects.get(name='Empty').pk, 'name': 'Empty', 'modules': []},
+                {
+                    'id': self.category.pk,
+                    'name': 'Teasers',
+                    'modules': [{
+                        'id': module.pk,
+                        'name': 'Hero',
+                        'plugin_type': 'Module',
+                        'add_url': admin_reverse('cms_add_module', args=[module.pk]),
+                        'preview_url': admin_reverse('cms_module_preview', args=[module.pk]),
+                        'applied': 0,
+                        'previewed': 0,
+                    }],
+                },
+            ],
+        })
+
+    @override_settings(LANGUAGES=(('en', 'English'), ('de', 'German')))
+    def test_catalog_prefers_module_variant_of_language(self):
+        module = self.create_module('Hero')
+        variant = self.create_module('Hero', language='de')
+        variant.update(source_module=module)
+        # Module names are not unique
+        other_module = self.create_module('Hero')
+        teaser = self.create_module('Teaser')
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(admin_reverse('cms_modules_catalog'), {'language': 'de'})
+
+        modules = response.json()['categories'][0]['modules']
+        self.assertEqual([module['id'] for module in modules], [variant.pk, other_module.pk, teaser.pk])
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(admin_reverse('cms_modules_catalog'), {'language': 'en'})
+
+        modules = response.json()['categories'][0]['modules']
+        self.assertEqual([module['id'] for module in modules], [module.pk, other_module.pk, teaser.pk])
+
+    def test_catalog_ordered_by_popularity(self):
+        hero = self.create_module('Hero')
+        teaser = self.create_module('Teaser')
+        ModuleUsage.objects.create(module=teaser, applied=3)
+        url = admin_reverse('cms_modules_catalog')
+
+        with self.login_user_context(self.superuser):
+            by_position = self.client.get(url).json()['categories'][0]['modules']
+            by_popularity = self.client.get(url, {'ordering': 'popularity'}).json()['categories'][0]['modules']
+
+        self.assertEqual([module['id'] for module in by_position], [hero.pk, teaser.pk])
+        self.assertEqual([module['id'] for module in by_popularity], [teaser.pk, hero.pk])
+        self.assertEqual(by_popularity[0]['applied'], 3)
+
+    def test_catalog_requires_staff(self):
+        response = self.client.get(admin_reverse('cms_modules_catalog'))
+        self.assertEqual(response.status_code, 403)
+
+
+class ModulePreviewViewTestCase(ModulesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_previews_root()
+        self.module = self.create_module('Hero', body='Hello')
+        self.url = admin_reverse('cms_module_preview', args=[self.module.pk])
+
+    def test_serves_cached_preview(self):
+        save_module_preview(self.module)
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(self.url)
+            self.assertContains(response, '<p>Hello</p>')
+
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+        flush_module_usage()
+        self.assertEqual(self.module.get_usage().previewed, 2)
+
+    def test_outdated_preview_is_not_served(self):
+        save_module_preview(self.module)
+        self.module.get_children()[0].get_bound_plugin().save()
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+
+class CreateModuleViewTestCase(ModulesTestCase):
+
+    def test_identical_module_is_not_duplicated(self):
+        module = self.create_module('Hero', body='Hello')
+        placeholder = self.get_placeholder()
+        add_plugin(placeholder, 'TextPlugin', 'en', body='Hello')
+        url = admin_reverse('cms_create_module') + f'?placeholder={placeholder.pk}&language=en'
+        data = {
+            'placeholder': placeholder.pk,
+            'language': 'en',
+            'name': 'Hero copy',
+            'category': self.category.pk,
+        }
+
+        with self.login_user_context(self.superuser):
+            response = self.client.post(url, data)
+
+            self.assertContains(response, 'An identical module')
+            self.assertContains(response, f'#cms-plugin-{module.pk}')
+            self.assertFalse(ModulePlugin.objects.filter(module_name='Hero copy').exists())
+
+            response = self.client.post(url, dict(data, allow_duplicate=True))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ModulePlugin.objects.get(module_name='Hero copy').content_hash, module.content_hash)
+
+    def test_edited_module_is_not_reported_as_duplicate(self):
+        module = self.create_module('Hero', body='Hello')
+        text = module.get_children()[0].get_bound_plugin()
+        url = self.category.modules.get_edit_url(text.pk) + '?cms_path=' + admin_reverse('cms_modules_list')
+
+        with self.login_user_context(self.superuser):
+            self.client.post(url, {'body': 'Hello again'})
+
+        self.assertEqual(module.get_children()[0].get_bound_plugin().body, 'Hello again')
+        module.refresh_from_db()
+        self.assertEqual(module.content_hash, module.get_content_hash())
+
+        placeholder = self.get_placeholder()
+        add_plugin(placeholder, 'TextPlugin', 'en', body='Hello')
+        plugins = list(placeholder.get_plugins('en'))
+        content_hash = get_content_hash(plugins)
+        self.assertIsNone(Module.get_duplicate_module(self.category, content_hash))
+
+        # Changed without a placeholder operation
+        module.update(content_hash=content_hash)
+        self.assertIsNone(Module.get_duplicate_module(self.category, content_hash))
+        module.refresh_from_db()
+        self.assertEqual(module.content_hash, module.get_content_hash())
+
+
+class AddModuleViewTestCase(ModulesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.module = self.create_module('Hero', body='Hello')
+        self.placeholder = self.get_placeholder()
+        self.siblings = [
+            add_plugin(self.placeholder, 'TextPlugin', 'en', body=body)
+            for body in ('One', 'Two', 'Three')
+        ]
+
+    def add_module(self, **data):
+        url = admin_reverse('cms_add_module', args=[self.module.pk]) + '?cms_path=/'
+        data = dict(data, target_placeholder=self.placeholder.pk, target_language='en')
+
+        with self.login_user_context(self.superuser):
+            return self.client.post(url, data)
+
+    def get_tree_order(self):
+        return self.placeholder.get_plugin_tree_order(language='en', parent_id=None)
+
+    def test_module_is_appended(self):
+        response = self.add_module()
+
+        self.assertEqual(response.status_code, 200)
+        new_module = ModulePlugin.objects.filter(placeholder=self.placeholder).get()
+        self.assertEqual(self.get_tree_order(), [plugin.pk for plugin in self.siblings] + [new_module.pk])
+        flush_module_usage()
+        self.assertEqual(self.module.get_usage().applied, 1)
+
+    def test_module_is_inserted_at_position(self):
+        response = self.add_module(target_position=1)
+
+        self.assertEqual(response.status_code, 200)
+        new_module = ModulePlugin.objects.filter(placeholder=self.placeholder).get()
+        one, two, three = self.siblings
+        self.assertEqual(self.get_tree_order(), [one.pk, new_module.pk, two.pk, three.pk])
+        self.assertEqual(new_module.get_children()[0].get_bound_plugin().body, 'Hello')
+
+    def test_concurrent_modification_is_retried(self):
+        insert_module_plugin = Module.insert_module_plugin
+
+        def insert_after_conflict(*args, **kwargs):
+            if insert.call_count == 1:
+                raise ConcurrentModification
+            return insert_module_plugin(*args, **kwargs)
+
+        with mock.patch.object(Module, 'insert_module_plugin', side_effect=insert_after_conflict) as insert:
+            response = self.add_module(target_position=0)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(insert.call_count, 2)
+        new_module = ModulePlugin.objects.filter(placeholder=self.placeholder).get()
+        self.assertEqual(self.get_tree_order(), [new_module.pk] + [plugin.pk for plugin in self.siblings])
+
+    @override_settings(DJANGOCMS_MODULES_INSERT_RETRIES=1)
+    def test_conflict_is_reported_once_retries_are_exhausted(self):
+        with mock.patch.object(Module, 'insert_module_plugin', side_effect=ConcurrentModification) as insert:
+            response = self.add_module()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(insert.call_count, 2)
+        self.assertFalse(ModulePlugin.objects.filter(placeholder=self.placeholder).exists())
+
+    @override_settings(DJANGOCMS_MODULES_INSERT_RETRIES=1)
+    def test_operation_is_only_recorded_for_the_applied_module(self):
+        tokens = []
+
+        def record_operation(sender, token, **kwargs):
+            # Like djangocms-history, operations are recorded in the database
+            Category.objects.create(name=f'Operation {token}')
+
+        def finish_operation(sender, token, **kwargs):
+            tokens.append(token)
+
+        pre_placeholder_operation.connect(record_operation, dispatch_uid='test_record_operation')
+        self.addCleanup(pre_placeholder_operation.disconnect, dispatch_uid='test_record_operation')
+        post_placeholder_operation.connect(finish_operation, dispatch_uid='test_finish_operation')
+        self.addCleanup(post_placeholder_operation.disconnect, dispatch_uid='test_finish_operation')
+        insert_module_plugin = Module.insert_module_plugin
+
+        def insert_after_conflict(*args, **kwargs):
+            if insert.call_count == 1:
+                raise ConcurrentModification
+            return insert_module_plugin(*args, **kwargs)
+
+        with mock.patch.object(Module, 'insert_module_plugin', side_effect=insert_after_conflict) as insert:
+            self.assertEqual(self.add_module().status_code, 200)
+
+        operations = Category.objects.filter(name__startswith='Operation').values_list('name', flat=True)
+        self.assertEqual(list(operations), [f'Operation {tokens[0]}'])
+
+        with mock.patch.object(Module, 'insert_module_plugin', side_effect=ConcurrentModification):
+            self.assertEqual(self.add_module().status_code, 409)
+
+        self.assertEqual(list(operations.all()), [f'Operation {tokens[0]}'])
+        self.assertEqual(len(tokens), 1)
+
+    def test_changed_siblings_are_detected(self):
+        def copy_and_add(*args, **kwargs):
+            new_plugins = copy_plugins_to_placeholder(*args, **kwargs)
+            # Another editor adds a plugin while the module is copied
+            add_plugin(self.placeholder, 'TextPlugin', 'en', body='Four')
+            return new_plugins
+
+        with mock.patch('djangocms_modules.cms_plugins.copy_plugins_to_placeholder', side_effect=copy_and_add):
+            with self.assertRaises(ConcurrentModification):
+                Module.insert_module_plugin(self.module, self.placeholder, language='en')
+
+
+class ModulesListViewTestCase(ModulesTestCase):
+
+    def create_categories(self, count):
+        start = Category.objects.count()
+
+        for index in range(start, start + count):
+            category = Category.objects.create(name=f'Category {index}')
+            self.create_module(f'Module {index}', category=category, body=f'Body {index}')
+
+    def setUp(self):
+        super().setUp()
+        # The first request creates the settings of the user
+        with self.login_user_context(self.superuser):
+            self.client.get(admin_reverse('cms_modules_list'))
+
+    def get_queries(self):
+        with self.login_user_context(self.superuser):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(admin_reverse('cms_modules_list'))
+
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_plugins_are_prefetched_for_all_categories(self):
+        self.create_categories(2)
+        queries, response = self.get_queries()
+        self.assertContains(response, '<p>Body 1</p>')
+        self.assertContains(response, 'Applied 0 times, previewed 0 times')
+
+        self.create_categories(4)
+        self.assertEqual(self.get_queries()[0], queries)
+
+    @override_settings(DJANGOCMS_MODULES_PREFETCH_PLUGINS=False)
+    def test_prefetching_can_be_disabled(self):
+        self.create_categories(2)
+        queries, response = self.get_queries()
+        self.assertContains(response, '<p>Body 1</p>')
+
+        self.create_categories(4)
+        self.assertGreater(self.get_queries()[0], queries)